@@ -13,8 +13,6 @@ __license__ = "MIT"
 __copyright__ = "Copyright 2026, AgentSecOps Team"
 
 # Import main modules for easy access
-from .main import main
-from .mistral_client import MistralClient, analyze_with_mistral_api
 from .securityinstructions import analyze_security
 from .parsing.textfile import read_text_file, parse_text
 from .reporting import generate_report
@@ -24,9 +22,33 @@ from .promptregistry import (
     SECURITY_ANALYSIS,
     SECURE_CODING_RECOMMENDATIONS,
     COMPLIANCE_ANALYSIS,
+    COMPOSITE_ANALYSIS,
     get_prompt,
+    get_composite_prompt,
 )
 
+# The CLI and the Mistral client (which pulls in requests) are loaded on first access
+# so that importing the package, or running a scan without --mistral, stays cheap.
+_LAZY_ATTRIBUTES = {
+    "main": ".main",
+    "MistralClient": ".mistral_client",
+    "analyze_with_mistral_api": ".mistral_client",
+}
+
+
+def __getattr__(name):
+    """Import lazily exported attributes on first access (PEP 562)."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
 __all__ = [
     "main",
     "MistralClient",
@@ -40,5 +62,7 @@ __all__ = [
     "SECURITY_ANALYSIS",
     "SECURE_CODING_RECOMMENDATIONS",
     "COMPLIANCE_ANALYSIS",
+    "COMPOSITE_ANALYSIS",
     "get_prompt",
+    "get_composite_prompt",
 ]
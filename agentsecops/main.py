@@ -6,16 +6,17 @@ with optional Mistral AI integration for advanced threat detection.
 """
 
 import argparse
+import functools
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
 # Local imports
-from .parsing.textfile import read_text_file, parse_text
+from .parsing.textfile import build_text_parser, read_text_file, parse_text
 from .securityinstructions import analyze_security
 from .reporting import generate_report
-from .mistral_client import MistralClient, analyze_with_mistral_api
 
 
 def main():
@@ -26,13 +27,32 @@ def main():
         prog="secure",
     )
 
-    # Required arguments
-    parser.add_argument("input_file", type=str, help="Path to the input text file to analyze")
+    # Input arguments
+    parser.add_argument(
+        "input_file", type=str, nargs="?", help="Path to the input text file to analyze"
+    )
+    parser.add_argument(
+        "--batch",
+        type=str,
+        metavar="DIR",
+        help="Analyze every file under DIR in parallel, writing one report per file",
+    )
 
     # Output options
     parser.add_argument(
         "-o", "--output", type=str, default="report.md", help="Output report file path"
     )
+    parser.add_argument(
+        "--report-dir",
+        type=str,
+        default="reports",
+        help="Directory for the per-file reports written in --batch mode",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of worker processes for --batch mode (defaults to the CPU count)",
+    )
 
     # Text processing options
     parser.add_argument(
@@ -50,6 +70,9 @@ def main():
     parser.add_argument(
         "--lines", action="store_true", help="Process line by line (removes empty lines)"
     )
+    parser.add_argument(
+        "--remove-numbers", action="store_true", help="Remove digits before analysis"
+    )
 
     # Mistral AI integration options
     parser.add_argument(
@@ -65,7 +88,8 @@ def main():
     parser.add_argument(
         "--analysis-type",
         type=str,
-        default="security_analysis",
+        nargs="+",
+        default=["security_analysis"],
         choices=[
             "prompt_injection",
             "hallucination",
@@ -73,7 +97,17 @@ def main():
             "secure_coding",
             "compliance",
         ],
-        help="Type of Mistral AI analysis to perform",
+        help="Type(s) of Mistral AI analysis to perform; several types run concurrently",
+    )
+    parser.add_argument(
+        "--composite",
+        action="store_true",
+        help="Request all analysis types in a single Mistral AI call instead of one call per type",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call Mistral AI instead of reusing cached responses for unchanged input",
     )
 
     # Advanced options
@@ -84,6 +118,17 @@ def main():
 
     args = parser.parse_args()
 
+    if args.batch:
+        if args.input_file:
+            parser.error("input_file cannot be combined with --batch")
+        if args.mistral:
+            parser.error("--mistral is not supported with --batch")
+        if args.workers is not None and args.workers < 1:
+            parser.error("--workers must be at least 1")
+        return _run_batch(args)
+    if not args.input_file:
+        parser.error("the following arguments are required: input_file (or --batch DIR)")
+
     try:
         # Step 1: Read and parse the input file
         if args.verbose:
@@ -103,7 +148,7 @@ def main():
                 print("⚠️  Skipping pattern-based security analysis as requested")
 
         # Step 3: Mistral AI analysis (if enabled)
-        mistral_analysis = {}
+        mistral_analyses = {}
         if args.mistral:
             if args.verbose:
                 print("🤖 Performing Mistral AI analysis...")
@@ -115,23 +160,74 @@ def main():
                 print("   Set MISTRAL_API_KEY environment variable or use --mistral-key option.")
                 return 1
 
+            # Deferred so runs without --mistral never import requests or sqlite3
+            import asyncio
+            import sqlite3
+
+            from .mistral_client import AsyncMistralClient, MistralClient, analyze_with_mistral_api
+            from .response_cache import ResponseCache
+
+            analysis_types = list(dict.fromkeys(args.analysis_type))
+            findings_for_ai = security_findings if security_findings else None
+
+            cache = None
+            if not args.no_cache:
+                try:
+                    cache = ResponseCache()
+                except (OSError, sqlite3.Error) as e:
+                    if args.verbose:
+                        print(f"⚠️  Response cache unavailable: {str(e)}")
+
+            # In verbose mode a single request is streamed and echoed as it is generated. The
+            # header waits for the first token: answers replayed from the cache stream nothing.
+            on_token = None
+            streamed = False
+
+            def _echo_token(token: str) -> None:
+                nonlocal streamed
+                if not streamed:
+                    print("📡 Streaming Mistral AI response:")
+                    streamed = True
+                print(token, end="", flush=True)
+
+            if args.verbose and (len(analysis_types) == 1 or args.composite):
+                on_token = _echo_token
+
             try:
-                mistral_analysis = analyze_with_mistral_api(
-                    parsed_content,
-                    api_key,
-                    args.analysis_type,
-                    security_findings if security_findings else None,
-                )
-
-                if "error" in mistral_analysis:
-                    print(f"⚠️  Mistral AI analysis error: {mistral_analysis['error']}")
-                    mistral_analysis = {}
+                if len(analysis_types) == 1:
+                    results = {
+                        analysis_types[0]: analyze_with_mistral_api(
+                            parsed_content,
+                            api_key,
+                            analysis_types[0],
+                            findings_for_ai,
+                            cache,
+                            on_token,
+                        )
+                    }
+                elif args.composite:
+                    client = MistralClient(api_key, cache=cache)
+                    results = client.analyze_composite(
+                        parsed_content, analysis_types, findings_for_ai, on_token
+                    )
                 else:
-                    if args.verbose:
-                        print("✅ Mistral AI analysis completed successfully")
+                    client = AsyncMistralClient(api_key, cache=cache)
+                    results = asyncio.run(
+                        client.analyze_async(parsed_content, analysis_types, findings_for_ai)
+                    )
+                if streamed:
+                    print()
+
+                for analysis_type, result in results.items():
+                    if "error" in result:
+                        print(f"⚠️  Mistral AI analysis error: {result['error']}")
+                    else:
+                        mistral_analyses[analysis_type] = result
+                        if args.verbose:
+                            print(f"✅ Mistral AI {analysis_type} analysis completed successfully")
             except Exception as e:
                 print(f"⚠️  Mistral AI analysis failed: {str(e)}")
-                mistral_analysis = {}
+                mistral_analyses = {}
 
         # Step 4: Generate comprehensive report
         if args.verbose:
@@ -141,7 +237,7 @@ def main():
         enhanced_findings = {
             "metadata": security_findings.get("metadata", {}) if security_findings else {},
             "pattern_analysis": security_findings.get("findings", {}) if security_findings else {},
-            "mistral_analysis": mistral_analysis,
+            "mistral_analyses": mistral_analyses,
         }
 
         generate_report(enhanced_findings, args.output)
@@ -165,5 +261,83 @@ def main():
         return 1
 
 
+# Text parser of the current batch worker process, built once by _init_batch_worker
+_batch_parser = None
+
+
+def _init_batch_worker(args: argparse.Namespace) -> None:
+    """Build the text parser once in each batch worker process."""
+    global _batch_parser
+    _batch_parser = build_text_parser(args)
+
+
+def _scan_file(path: str, run_patterns: bool = True) -> Dict[str, Any]:
+    """
+    Read, parse and pattern-scan one file in a batch worker.
+
+    Args:
+        path: Path of the file to analyze
+        run_patterns: Whether to run the pattern-based security analysis
+
+    Returns:
+        Findings in the layout expected by generate_report, or a dict with an "error" key
+    """
+    try:
+        parsed_content = _batch_parser(read_text_file(path))
+    except (OSError, ValueError) as e:
+        return {"error": str(e)}
+
+    security_findings = analyze_security(parsed_content) if run_patterns else {}
+    return {
+        "metadata": security_findings.get("metadata", {}),
+        "pattern_analysis": security_findings.get("findings", {}),
+        "mistral_analyses": {},
+    }
+
+
+def _run_batch(args: argparse.Namespace) -> int:
+    """Analyze every file under args.batch across worker processes."""
+    batch_dir = Path(args.batch)
+    if not batch_dir.is_dir():
+        print(f"❌ Error: Not a directory: {args.batch}")
+        return 1
+
+    # Reports written into the batch directory by an earlier run are not analyzed again
+    report_dir = Path(args.report_dir)
+    resolved_report_dir = report_dir.resolve()
+    paths = sorted(
+        path
+        for path in batch_dir.rglob("*")
+        if path.is_file() and resolved_report_dir not in path.resolve().parents
+    )
+    if not paths:
+        print(f"❌ Error: No files found in: {args.batch}")
+        return 1
+
+    if args.verbose:
+        print(f"📂 Analyzing {len(paths)} files from: {args.batch}")
+
+    # Pattern scanning is CPU-bound, so fan out across processes rather than threads
+    failures = 0
+    scan_file = functools.partial(_scan_file, run_patterns=not args.no_patterns)
+    with ProcessPoolExecutor(
+        max_workers=args.workers, initializer=_init_batch_worker, initargs=(args,)
+    ) as executor:
+        results = executor.map(scan_file, map(str, paths), chunksize=8)
+        for path, findings in zip(paths, results):
+            if "error" in findings:
+                print(f"❌ Error: {path}: {findings['error']}")
+                failures += 1
+                continue
+
+            report_path = report_dir / path.relative_to(batch_dir).with_name(f"{path.name}.md")
+            generate_report(findings, str(report_path))
+            if args.verbose:
+                print(f"📋 Report generated: {report_path}")
+
+    print(f"📋 {len(paths) - failures} of {len(paths)} reports generated in: {report_dir}")
+    return 1 if failures else 0
+
+
 if __name__ == "__main__":
     sys.exit(main())
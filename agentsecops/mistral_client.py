@@ -4,22 +4,108 @@ Mistral AI API Client
 This module provides integration with Mistral AI's chat completions API for security analysis.
 """
 
+import asyncio
+import functools
 import os
 import json
+import re
 import requests
-from typing import Dict, Any, Optional
-from .promptregistry import get_prompt, get_security_advisor_guidance
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, Any, List, Optional
+from urllib3.util.retry import Retry
+from .promptregistry import get_composite_prompt, get_prompt, get_security_advisor_guidance
+from .response_cache import ResponseCache
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speed-up
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_dumps_compact(value: Any) -> str:
+    """Serialize value as compact JSON; indentation would only cost prompt tokens."""
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+# Runs of spaces and tabs after the first non-blank character of a line
+_INTERIOR_SPACE_RUN = re.compile(r"(?<=\S)[ \t]{2,}")
+
+# Transient statuses (rate limiting and server errors) retried with exponential backoff
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Analysis types whose prompts are extended with the security advisor guidance
+_ADVISED_ANALYSIS_TYPES = frozenset({"prompt_injection", "security_analysis", "secure_coding"})
+
+
+def _cached_response(method):
+    """Serve analyze_with_mistral from the client's response cache when possible."""
+
+    @functools.wraps(method)
+    def wrapper(
+        self,
+        text: str,
+        analysis_type: str = "security_analysis",
+        security_findings: Optional[Dict] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Any]:
+        if self.cache is None:
+            return method(self, text, analysis_type, security_findings, on_token)
+
+        key = self.cache.make_key(self.model, analysis_type, text, security_findings)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = method(self, text, analysis_type, security_findings, on_token)
+        # Only successful analyses are worth replaying
+        if "error" not in result:
+            self.cache.set(key, result)
+        return result
+
+    return wrapper
+
+
+def _compact_text(text: str) -> str:
+    """
+    Shrink text before it is sent to the model, keeping its lines and their layout.
+
+    Trailing whitespace is dropped and runs of spaces and tabs inside a line collapse to
+    one space. Leading indentation is kept so code keeps its block structure, and no line
+    is removed so the line numbers in the security findings still point at the right
+    lines. Input tokens drive both latency and cost, and this padding carries no signal.
+    """
+    return "\n".join(_INTERIOR_SPACE_RUN.sub(" ", line.rstrip()) for line in text.splitlines())
+
+
+def _parse_content(content: str, api_response: Any) -> Dict[str, Any]:
+    """Parse the model's JSON answer, returning an error with the raw content on failure."""
+    try:
+        # Parse the JSON response
+        return _json_loads(content)
+    except json.JSONDecodeError:
+        # If JSON parsing fails, return the raw content
+        return {
+            "error": "Failed to parse Mistral response as JSON",
+            "raw_response": content,
+            "full_api_response": api_response,
+        }
 
 
 class MistralClient:
     """Client for interacting with Mistral AI's chat completions API."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[ResponseCache] = None):
         """
         Initialize the Mistral client.
 
         Args:
             api_key: Mistral API key. If not provided, will look for MISTRAL_API_KEY in environment.
+            cache: Optional response cache consulted before calling the API
         """
         self.api_key = api_key or os.environ.get("MISTRAL_API_KEY")
         if not self.api_key:
@@ -28,16 +114,39 @@ class MistralClient:
             )
 
         self.base_url = "https://api.mistral.ai/v1/chat/completions"
+        self.model = "mistral-large-latest"
+        self.cache = cache
         self.headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}",
         }
 
+        # Reuse one pooled keep-alive session so TCP/TLS setup is paid once per client
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.3,
+                status_forcelist=_RETRY_STATUSES,
+                # Completions have no side effects, so retrying the POST is safe
+                allowed_methods=frozenset({"POST"}),
+                respect_retry_after_header=True,
+                # Hand the final error response back instead of raising MaxRetryError
+                raise_on_status=False,
+            ),
+        )
+        self._session.mount("https://", adapter)
+
+    @_cached_response
     def analyze_with_mistral(
         self,
         text: str,
         analysis_type: str = "security_analysis",
         security_findings: Optional[Dict] = None,
+        on_token: Optional[Callable[[str], None]] = None,
     ) -> Dict[str, Any]:
         """
         Analyze text using Mistral AI with the specified analysis type.
@@ -46,6 +155,8 @@ class MistralClient:
             text: Text to analyze
             analysis_type: Type of analysis to perform (prompt_injection, hallucination, security_analysis, etc.)
             security_findings: Optional security findings from pattern matching
+            on_token: Optional callback; when given, the answer is streamed and each
+                generated token is passed to it as it arrives
 
         Returns:
             Dictionary containing the analysis results
@@ -53,25 +164,107 @@ class MistralClient:
         # Get the appropriate system prompt
         system_prompt = get_prompt(analysis_type)
 
-        # Format the prompt with the text and optional findings
-        prompt_vars = {"text": text}
+        # Format the prompt with the compacted text and optional findings
+        prompt_vars = {"text": _compact_text(text)}
         if security_findings:
-            prompt_vars["security_findings"] = json.dumps(security_findings, indent=2)
+            prompt_vars["security_findings"] = _json_dumps_compact(security_findings)
 
         formatted_prompt = system_prompt.format(**prompt_vars)
         advisor_guidance = get_security_advisor_guidance()
-        if advisor_guidance and analysis_type in {
-            "prompt_injection",
-            "security_analysis",
-            "secure_coding",
-        }:
+        if advisor_guidance and analysis_type in _ADVISED_ANALYSIS_TYPES:
             formatted_prompt = (
                 f"{formatted_prompt}\n\nSecurity advisor guidance:\n{advisor_guidance}"
             )
 
+        return self._complete(formatted_prompt, on_token=on_token)
+
+    def analyze_composite(
+        self,
+        text: str,
+        analysis_types: List[str],
+        security_findings: Optional[Dict] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Run several analysis types on the same text with a single API request.
+
+        Args:
+            text: Text to analyze
+            analysis_types: Types of analysis to perform
+            security_findings: Optional security findings from pattern matching
+            on_token: Optional callback receiving each generated token as it is streamed
+
+        Returns:
+            Dictionary mapping each analysis type to its analysis results
+        """
+        analysis_types = list(analysis_types)
+        cache_key = None
+        if self.cache is not None:
+            # Composite results are shaped differently from single analyses, so their keys
+            # live in their own namespace even when only one type is requested
+            cache_key = self.cache.make_key(
+                self.model, "composite:" + "+".join(analysis_types), text, security_findings
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        prompt_vars = {
+            "text": _compact_text(text),
+            "security_findings": (
+                _json_dumps_compact(security_findings) if security_findings else "None"
+            ),
+        }
+        formatted_prompt = get_composite_prompt(tuple(analysis_types)).format(**prompt_vars)
+        advisor_guidance = get_security_advisor_guidance()
+        if advisor_guidance and _ADVISED_ANALYSIS_TYPES.intersection(analysis_types):
+            formatted_prompt = (
+                f"{formatted_prompt}\n\nSecurity advisor guidance:\n{advisor_guidance}"
+            )
+
+        # Each analysis keeps the token budget it would have had as its own request
+        result = self._complete(
+            formatted_prompt, max_tokens=1000 * len(analysis_types), on_token=on_token
+        )
+        if "error" in result:
+            return {analysis_type: result for analysis_type in analysis_types}
+
+        results = {}
+        for analysis_type in analysis_types:
+            analysis = result.get(analysis_type)
+            if isinstance(analysis, dict):
+                results[analysis_type] = analysis
+            else:
+                results[analysis_type] = {
+                    "error": f"Mistral response did not include a {analysis_type} analysis",
+                    "raw_response": result,
+                }
+
+        if cache_key is not None and not any("error" in r for r in results.values()):
+            self.cache.set(cache_key, results)
+        return results
+
+    def _complete(
+        self,
+        formatted_prompt: str,
+        max_tokens: int = 1000,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send one prompt to the chat completions API and parse the JSON answer.
+
+        Args:
+            formatted_prompt: Fully formatted user prompt
+            max_tokens: Maximum number of tokens to generate
+            on_token: Optional callback; when given, the answer is streamed over
+                server-sent events and each token is passed to it as it arrives
+
+        Returns:
+            Dictionary parsed from the model's JSON answer, or an error dictionary
+        """
         # Prepare the request payload
         payload = {
-            "model": "mistral-large-latest",
+            "model": self.model,
             "messages": [
                 {
                     "role": "system",
@@ -80,32 +273,36 @@ class MistralClient:
                 {"role": "user", "content": formatted_prompt},
             ],
             "temperature": 0.2,
-            "max_tokens": 1000,
+            "max_tokens": max_tokens,
             "response_format": {"type": "json_object"},
         }
+        if on_token is not None:
+            payload["stream"] = True
 
         try:
             # Make the API request
-            response = requests.post(self.base_url, headers=self.headers, json=payload, timeout=30)
+            response = self._session.post(
+                self.base_url, json=payload, timeout=30, stream=on_token is not None
+            )
+
+            if response.status_code >= 400:
+                response.close()
+                return {
+                    "error": f"Mistral API request failed with HTTP {response.status_code}: "
+                    f"{response.reason}",
+                    "status_code": response.status_code,
+                }
 
-            response.raise_for_status()
+            if on_token is not None:
+                return self._read_stream(response, on_token)
 
-            # Parse and return the response
-            result = response.json()
+            # Parse the raw body once, without requests' text decoding step
+            result = _json_loads(response.content)
 
             # Extract the content from the response
             if "choices" in result and len(result["choices"]) > 0:
                 content = result["choices"][0]["message"]["content"]
-                try:
-                    # Parse the JSON response
-                    return json.loads(content)
-                except json.JSONDecodeError:
-                    # If JSON parsing fails, return the raw content
-                    return {
-                        "error": "Failed to parse Mistral response as JSON",
-                        "raw_response": content,
-                        "full_api_response": result,
-                    }
+                return _parse_content(content, result)
             else:
                 return {"error": "No valid response from Mistral API", "full_api_response": result}
 
@@ -114,8 +311,41 @@ class MistralClient:
                 "error": f"Mistral API request failed: {str(e)}",
                 "exception_type": type(e).__name__,
             }
-        except Exception as e:
-            return {"error": f"Unexpected error: {str(e)}", "exception_type": type(e).__name__}
+        except json.JSONDecodeError as e:
+            return {
+                "error": f"Mistral API returned invalid JSON: {str(e)}",
+                "exception_type": type(e).__name__,
+            }
+        except (AttributeError, IndexError, KeyError, TypeError) as e:
+            return {
+                "error": f"Unexpected Mistral API response format: {str(e)}",
+                "exception_type": type(e).__name__,
+            }
+
+    @staticmethod
+    def _read_stream(response, on_token: Callable[[str], None]) -> Dict[str, Any]:
+        """Collect a streamed chat completion, passing each token to on_token."""
+        tokens = []
+        last_chunk = None
+        with response:
+            for line in response.iter_lines():
+                # Server-sent events: payload lines start with "data: "; skip keep-alives
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+
+                last_chunk = _json_loads(data)
+                for choice in last_chunk.get("choices", []):
+                    token = choice.get("delta", {}).get("content")
+                    if token:
+                        tokens.append(token)
+                        on_token(token)
+
+        if not tokens:
+            return {"error": "No valid response from Mistral API", "full_api_response": last_chunk}
+        return _parse_content("".join(tokens), last_chunk)
 
     def analyze_prompt_injection(self, text: str) -> Dict[str, Any]:
         """Analyze text for prompt injection attempts."""
@@ -140,11 +370,68 @@ class MistralClient:
         return self.analyze_with_mistral(text, "compliance")
 
 
+class AsyncMistralClient:
+    """Asyncio front-end that runs several Mistral analyses concurrently."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_workers: int = 8,
+        cache: Optional[ResponseCache] = None,
+    ):
+        """
+        Initialize the async Mistral client.
+
+        Args:
+            api_key: Mistral API key. If not provided, will look for MISTRAL_API_KEY in environment.
+            max_workers: Maximum number of requests in flight at once
+            cache: Optional response cache consulted before calling the API
+        """
+        # Blocking calls share the wrapped client's pooled session across worker threads
+        self._client = MistralClient(api_key, cache)
+        self.max_workers = max_workers
+
+    async def analyze_async(
+        self,
+        text: str,
+        analysis_types: List[str],
+        security_findings: Optional[Dict] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Run the requested analysis types concurrently on the same text.
+
+        Args:
+            text: Text to analyze
+            analysis_types: Types of analysis to perform
+            security_findings: Optional security findings from pattern matching
+
+        Returns:
+            Dictionary mapping each analysis type to its analysis results
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def _analyze(analysis_type: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await loop.run_in_executor(
+                    None,
+                    self._client.analyze_with_mistral,
+                    text,
+                    analysis_type,
+                    security_findings,
+                )
+
+        results = await asyncio.gather(*(_analyze(t) for t in analysis_types))
+        return dict(zip(analysis_types, results))
+
+
 def analyze_with_mistral_api(
     text: str,
     api_key: Optional[str] = None,
     analysis_type: str = "security_analysis",
     security_findings: Optional[Dict] = None,
+    cache: Optional[ResponseCache] = None,
+    on_token: Optional[Callable[[str], None]] = None,
 ) -> Dict[str, Any]:
     """
     Convenience function to analyze text with Mistral AI without creating a client instance.
@@ -154,13 +441,15 @@ def analyze_with_mistral_api(
         api_key: Mistral API key (optional)
         analysis_type: Type of analysis to perform
         security_findings: Optional security findings from pattern matching
+        cache: Optional response cache consulted before calling the API
+        on_token: Optional callback receiving each generated token as it is streamed
 
     Returns:
         Dictionary containing the analysis results
     """
     try:
-        client = MistralClient(api_key)
-        return client.analyze_with_mistral(text, analysis_type, security_findings)
+        client = MistralClient(api_key, cache)
+        return client.analyze_with_mistral(text, analysis_type, security_findings, on_token)
     except ValueError as e:
         return {"error": str(e)}
     except Exception as e:
@@ -12,17 +12,27 @@ Features:
 """
 
 import argparse
+import functools
 import json
+import mmap
+import os
 from pathlib import Path
-from typing import Optional, Union
+from typing import Callable, List, Optional, Union
 import sys
 
+from ..scan_engine import remove_numbers
+
+# Files larger than this are decoded straight from a memory map
+MMAP_THRESHOLD = 1024 * 1024
+
 
 def read_text_file(file_path: Union[str, Path]) -> str:
     """Read a text file and return its content as a string."""
 
     # check if file_path is provided, if not read from stdin
     if file_path:
+        if os.path.getsize(file_path) > MMAP_THRESHOLD:
+            return _read_mapped_file(file_path)
         try:
             with open(file_path, "r", encoding="utf-8") as f:
                 return f.read()
@@ -39,28 +49,95 @@ def read_text_file(file_path: Union[str, Path]) -> str:
         return sys.stdin.read()
 
 
+def _read_mapped_file(file_path: Union[str, Path]) -> str:
+    """Decode a large file from a read-only memory map, avoiding an extra bytes copy."""
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as data:
+            try:
+                text = str(data, "utf-8")
+            except UnicodeDecodeError:
+                text = str(data, "latin-1")
+
+    # Match the universal newline translation of text-mode reads
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def build_text_parser(args: argparse.Namespace) -> Callable[[str], str]:
+    """
+    Build a text parser specialized for the given options.
+
+    The option checks happen once here, so the returned function only runs the selected
+    steps; reuse it when parsing many inputs with the same options.
+    """
+    lowercase = _option(args, "lowercase")
+
+    steps = []
+    if _option(args, "remove_numbers"):
+        steps.append(remove_numbers)
+    if _option(args, "remove_whitespace"):
+        # Collapsing whitespace already strips both ends and leaves a single line, so the
+        # strip and line passes are redundant; lowercase the shorter collapsed text.
+        steps.append(_collapse_whitespace)
+        if lowercase:
+            steps.append(str.lower)
+        if _option(args, "lines"):
+            return _chain(steps)
+    else:
+        if lowercase:
+            steps.append(str.lower)
+        if _option(args, "strip"):
+            steps.append(str.strip)
+        if _option(args, "lines"):
+            steps.append(_nonempty_lines)
+            return _chain(steps)
+
+    # Handle JSON if requested
+    if _option(args, "parse_json"):
+        steps.append(functools.partial(_format_json, strict=_option(args, "strict")))
+
+    return _chain(steps)
+
+
 def parse_text(content: str, args: argparse.Namespace) -> str:
     """Parse text according to specified options."""
-    result = content
-
-    # Apply preprocessing
-    if hasattr(args, "lowercase") and args.lowercase:
-        result = result.lower()
-    if hasattr(args, "strip") and args.strip:
-        result = result.strip()
-    if hasattr(args, "remove_whitespace") and args.remove_whitespace:
-        result = " ".join(result.split())
-    if hasattr(args, "lines") and args.lines:
-        return "\n".join(line.strip() for line in result.splitlines() if line.strip())
+    return build_text_parser(args)(content)
 
-    # Handle JSON if requested
-    if hasattr(args, "parse_json") and args.parse_json:
-        try:
-            data = json.loads(result)
-            return json.dumps(data, indent=2)
-        except json.JSONDecodeError:
-            if hasattr(args, "strict") and args.strict:
-                raise ValueError("Invalid JSON format")
-            return result  # Return original if not valid JSON
-
-    return result
+
+def _option(args: argparse.Namespace, name: str) -> bool:
+    """Return whether a flag is set, treating a missing attribute as unset."""
+    return bool(getattr(args, name, False))
+
+
+def _chain(steps: List[Callable[[str], str]]) -> Callable[[str], str]:
+    """Compose parsing steps into a single function."""
+    steps = tuple(steps)
+
+    def parse(content: str) -> str:
+        for step in steps:
+            content = step(content)
+        return content
+
+    return parse
+
+
+def _collapse_whitespace(text: str) -> str:
+    """Collapse every whitespace run to one space and strip both ends."""
+    return " ".join(text.split())
+
+
+def _nonempty_lines(text: str) -> str:
+    """Strip each line once and drop the empty ones without a Python-level loop."""
+    return "\n".join(filter(None, map(str.strip, text.splitlines())))
+
+
+def _format_json(text: str, strict: bool = False) -> str:
+    """Pretty-print JSON text, returning it unchanged (or raising if strict) when invalid."""
+    try:
+        data = json.loads(text)
+        return json.dumps(data, indent=2)
+    except json.JSONDecodeError:
+        if strict:
+            raise ValueError("Invalid JSON format")
+        return text  # Return original if not valid JSON
@@ -4,6 +4,12 @@ Prompt Registry Module
 This module contains system prompts for security analysis using Mistral AI.
 """
 
+from functools import lru_cache
+from typing import Tuple
+
+# Bump whenever a prompt changes so cached responses to older prompts are not reused
+PROMPT_VERSION = "4"
+
 # Security advisor guidance used to shape remediation quality and consistency.
 SECURITY_ADVISOR_GUIDANCE = """
 Apply these controls when producing findings and recommendations:
@@ -114,6 +120,32 @@ Please provide your compliance analysis in JSON format:
 }}
 """
 
+# System prompt header for running several analyses in one request; the per-type response
+# structures are appended by get_composite_prompt()
+COMPOSITE_ANALYSIS = """
+You are an AI security analyst. Perform each of the analyses listed below on the following
+text in a single pass.
+
+Text to analyze:
+{text}
+
+Security findings from pattern matching:
+{security_findings}
+
+Please provide your analysis as one JSON object with one top-level key per analysis type,
+each following the structure shown:
+"""
+
+
+# Registry of prompts by analysis type, built once at import time
+_PROMPTS = {
+    "prompt_injection": PROMPT_INJECTION_DETECTION,
+    "hallucination": HALLUCINATION_RISK_DETECTION,
+    "security_analysis": SECURITY_ANALYSIS,
+    "secure_coding": SECURE_CODING_RECOMMENDATIONS,
+    "compliance": COMPLIANCE_ANALYSIS,
+}
+
 
 def get_prompt(prompt_type: str) -> str:
     """
@@ -128,22 +160,42 @@ def get_prompt(prompt_type: str) -> str:
     Raises:
         ValueError: If prompt_type is not recognized
     """
-    prompts = {
-        "prompt_injection": PROMPT_INJECTION_DETECTION,
-        "hallucination": HALLUCINATION_RISK_DETECTION,
-        "security_analysis": SECURITY_ANALYSIS,
-        "secure_coding": SECURE_CODING_RECOMMENDATIONS,
-        "compliance": COMPLIANCE_ANALYSIS,
-    }
-
-    if prompt_type not in prompts:
+    if prompt_type not in _PROMPTS:
         raise ValueError(
-            f"Unknown prompt type: {prompt_type}. Available types: {list(prompts.keys())}"
+            f"Unknown prompt type: {prompt_type}. Available types: {list(_PROMPTS.keys())}"
         )
 
-    return prompts[prompt_type]
+    return _PROMPTS[prompt_type]
+
+
+def _response_structure(prompt: str) -> str:
+    """Return the (brace-escaped) JSON response structure at the end of a prompt."""
+    return prompt[prompt.rindex("\n{{") + 1 :].strip()
+
+
+@lru_cache(maxsize=None)
+def get_composite_prompt(analysis_types: Tuple[str, ...]) -> str:
+    """
+    Build a prompt that requests several analysis types in one response.
+
+    Args:
+        analysis_types: Types of analysis to combine, in order
+
+    Returns:
+        Prompt template with {text} and {security_findings} placeholders
+
+    Raises:
+        ValueError: If any analysis type is not recognized
+    """
+    sections = []
+    for analysis_type in analysis_types:
+        structure = _response_structure(get_prompt(analysis_type)).replace("\n", "\n  ")
+        sections.append(f'  "{analysis_type}": {structure}')
+
+    return COMPOSITE_ANALYSIS + "{{\n" + ",\n".join(sections) + "\n}}\n"
 
 
+@lru_cache(maxsize=None)
 def get_security_advisor_guidance() -> str:
     """Return security advisor guidance text for prompt augmentation."""
     return SECURITY_ADVISOR_GUIDANCE.strip()
@@ -4,10 +4,44 @@ Reporting Module
 This module provides functionality to generate security reports in markdown format.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Callable
 from pathlib import Path
 import datetime
 import json
+import os
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speed-up
+    orjson = None
+
+# Buffer size used when streaming a report to disk
+REPORT_WRITE_BUFFER = 1 << 16
+
+# Pattern-finding sections of the report:
+# (category, heading, summary label, finding key to display)
+_FINDING_SECTIONS = (
+    ("passwords", "Potential Passwords Found", "Passwords", "match"),
+    ("api_keys", "Potential API Keys Found", "API Keys", "match"),
+    ("sensitive_data", "Potential Sensitive Data Found", "Sensitive Data", "match"),
+    ("security_issues", "Security Issues Found", "Security Issues", "issue"),
+)
+
+# Secure-coding recommendation categories and their display names
+_SECURE_CODING_CATEGORIES = (
+    ("immediate_actions", "Immediate Actions"),
+    ("code_refactoring", "Code Refactoring"),
+    ("configuration_changes", "Configuration Changes"),
+    ("monitoring_recommendations", "Monitoring Recommendations"),
+    ("training_recommendations", "Training Recommendations"),
+)
+
+# Compliance standards and their display names
+_COMPLIANCE_STANDARDS = (
+    ("gdpr_compliance", "GDPR"),
+    ("pci_dss_compliance", "PCI_DSS"),
+    ("hipaa_compliance", "HIPAA"),
+)
 
 
 def generate_report(findings: Dict[str, Any], output_path: str = "report.md") -> None:
@@ -18,287 +52,299 @@ def generate_report(findings: Dict[str, Any], output_path: str = "report.md") ->
         findings: Dictionary containing security findings
         output_path: Path to save the markdown report
     """
-    report_content = _generate_report_content(findings)
-
     # Ensure output directory exists
     output_path_obj = Path(output_path)
     output_path_obj.parent.mkdir(parents=True, exist_ok=True)
 
-    # Write the report
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(report_content)
-
+    # Stream the report into a temporary sibling instead of building it in memory first,
+    # then swap it in, so a renderer failing halfway never leaves a truncated report behind.
+    # The random name is created exclusively with the default mode, so umask still applies.
+    temp_path = output_path_obj.with_name(f".{output_path_obj.name}.{os.urandom(4).hex()}.tmp")
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with open(fd, "w", encoding="utf-8", buffering=REPORT_WRITE_BUFFER) as f:
+            _emit_report(findings, f.write)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        temp_path.unlink()
+        raise
+
+
+def _emit_report(findings: Dict[str, Any], write: Callable[[str], None]) -> None:
+    """
+    Render the security report piece by piece.
 
-def _generate_report_content(findings: Dict[str, Any]) -> str:
-    """Generate the markdown content for the security report."""
+    Args:
+        findings: Dictionary containing security findings
+        write: Callable receiving each chunk of markdown in order
+    """
     report_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    content = []
-    content.append(f"# Security Analysis Report\n")
-    content.append(f"**Generated:** {report_date}\n")
-    content.append(f"\n---\n")
-
-    # Metadata section
-    content.append(f"## Analysis Metadata\n")
     metadata = findings.get("metadata", {})
-    content.append(f"- **Content Length:** {metadata.get('content_length', 0)} characters\n")
-    content.append(f"- **Line Count:** {metadata.get('line_count', 0)} lines\n")
-    content.append(f"\n---\n")
 
-    # Pattern-based analysis section
+    # Title and metadata section in a single write
+    write(
+        f"# Security Analysis Report\n"
+        f"**Generated:** {report_date}\n"
+        f"\n---\n"
+        f"## Analysis Metadata\n"
+        f"- **Content Length:** {metadata.get('content_length', 0)} characters\n"
+        f"- **Line Count:** {metadata.get('line_count', 0)} lines\n"
+        f"\n---\n"
+    )
+
+    # Pattern-based analysis section; each category is looked up once for the whole report
     pattern_analysis = findings.get("pattern_analysis", {})
+    category_findings = [
+        (heading, label, value_key, pattern_analysis.get(category, []))
+        for category, heading, label, value_key in _FINDING_SECTIONS
+    ]
     if pattern_analysis:
-        content.append(f"## 🔍 Pattern-Based Security Analysis\n")
-
-        # Passwords section
-        passwords = pattern_analysis.get("passwords", [])
-        if passwords:
-            content.append(f"### 🔴 Potential Passwords Found ({len(passwords)})\n")
-            for finding in passwords:
-                content.append(
-                    f"**Line {finding.get('line', 'Unknown')}:** `{finding.get('match', '')}`\n"
-                )
-                content.append(f"**Context:** `{finding.get('context', '')}`\n")
-                content.append(f"\n")
-
-        # API Keys section
-        api_keys = pattern_analysis.get("api_keys", [])
-        if api_keys:
-            content.append(f"### 🔴 Potential API Keys Found ({len(api_keys)})\n")
-            for finding in api_keys:
-                content.append(
-                    f"**Line {finding.get('line', 'Unknown')}:** `{finding.get('match', '')}`\n"
-                )
-                content.append(f"**Context:** `{finding.get('context', '')}`\n")
-                content.append(f"\n")
-
-        # Sensitive Data section
-        sensitive_data = pattern_analysis.get("sensitive_data", [])
-        if sensitive_data:
-            content.append(f"### 🔴 Potential Sensitive Data Found ({len(sensitive_data)})\n")
-            for finding in sensitive_data:
-                content.append(
-                    f"**Line {finding.get('line', 'Unknown')}:** `{finding.get('match', '')}`\n"
-                )
-                content.append(f"**Context:** `{finding.get('context', '')}`\n")
-                content.append(f"\n")
-
-        # Security Issues section
-        security_issues = pattern_analysis.get("security_issues", [])
-        if security_issues:
-            content.append(f"### 🔴 Security Issues Found ({len(security_issues)})\n")
-            for finding in security_issues:
-                content.append(
-                    f"**Line {finding.get('line', 'Unknown')}:** {finding.get('issue', '')}\n"
-                )
-                content.append(f"**Context:** `{finding.get('context', '')}`\n")
-                content.append(f"\n")
-
-        content.append(f"\n---\n")
+        write(f"## 🔍 Pattern-Based Security Analysis\n")
+
+        for heading, _, value_key, items in category_findings:
+            write(_findings_block(heading, items, value_key))
+
+        write(f"\n---\n")
 
     # Mistral AI analysis section
-    mistral_analysis = findings.get("mistral_analysis", {})
-    if mistral_analysis:
-        content.append(f"## 🤖 Mistral AI Analysis\n")
-
-        # Handle different analysis types
-        if "prompt_injection_detected" in mistral_analysis:
-            content.append(f"### Prompt Injection Analysis\n")
-            content.append(
-                f"- **Detected:** {mistral_analysis.get('prompt_injection_detected', False)}\n"
-            )
-            content.append(f"- **Confidence:** {mistral_analysis.get('confidence_score', 0):.2f}\n")
-            if mistral_analysis.get("vulnerabilities_found"):
-                content.append(
-                    f"- **Vulnerabilities:** {', '.join(mistral_analysis['vulnerabilities_found'])}\n"
-                )
-            if mistral_analysis.get("analysis"):
-                content.append(f"\n**Analysis:**\n\n{mistral_analysis['analysis']}\n\n")
-            if mistral_analysis.get("recommendations"):
-                content.append(
-                    f"**Recommendations:**\n\n"
-                    + "\n".join([f"- {rec}" for rec in mistral_analysis["recommendations"]])
-                    + "\n\n"
-                )
-
-        elif "hallucination_risk_detected" in mistral_analysis:
-            content.append(f"### Hallucination Risk Analysis\n")
-            content.append(
-                f"- **Risk Detected:** {mistral_analysis.get('hallucination_risk_detected', False)}\n"
-            )
-            content.append(f"- **Confidence:** {mistral_analysis.get('confidence_score', 0):.2f}\n")
-            if mistral_analysis.get("risk_factors"):
-                content.append(
-                    f"- **Risk Factors:** {', '.join(mistral_analysis['risk_factors'])}\n"
-                )
-            if mistral_analysis.get("analysis"):
-                content.append(f"\n**Analysis:**\n\n{mistral_analysis['analysis']}\n\n")
-            if mistral_analysis.get("recommendations"):
-                content.append(
-                    f"**Recommendations:**\n\n"
-                    + "\n".join([f"- {rec}" for rec in mistral_analysis["recommendations"]])
-                    + "\n\n"
-                )
-
-        elif "overall_security_score" in mistral_analysis:
-            content.append(f"### Comprehensive Security Analysis\n")
-            content.append(
-                f"- **Overall Score:** {mistral_analysis.get('overall_security_score', 0):.2f}/1.0\n"
-            )
+    mistral_analyses = _collect_mistral_analyses(findings)
+    if mistral_analyses:
+        write(f"## 🤖 Mistral AI Analysis\n")
 
-            critical = mistral_analysis.get("critical_issues", [])
-            medium = mistral_analysis.get("medium_issues", [])
-            low = mistral_analysis.get("low_issues", [])
-
-            content.append(f"- **Critical Issues:** {len(critical)}\n")
-            content.append(f"- **Medium Issues:** {len(medium)}\n")
-            content.append(f"- **Low Issues:** {len(low)}\n")
-
-            if critical:
-                content.append(f"\n**Critical Issues:**\n")
-                for issue in critical:
-                    content.append(f"- {issue}\n")
-
-            if medium:
-                content.append(f"\n**Medium Issues:**\n")
-                for issue in medium:
-                    content.append(f"- {issue}\n")
-
-            if low:
-                content.append(f"\n**Low Issues:**\n")
-                for issue in low:
-                    content.append(f"- {issue}\n")
-
-            if mistral_analysis.get("detailed_analysis"):
-                content.append(
-                    f"\n**Detailed Analysis:**\n\n{mistral_analysis['detailed_analysis']}\n\n"
-                )
-
-            if mistral_analysis.get("remediation_recommendations"):
-                content.append(
-                    f"**Remediation Recommendations:**\n\n"
-                    + "\n".join(
-                        [f"- {rec}" for rec in mistral_analysis["remediation_recommendations"]]
-                    )
-                    + "\n\n"
-                )
-
-        elif "immediate_actions" in mistral_analysis:
-            content.append(f"### Secure Coding Recommendations\n")
-
-            categories = [
-                "immediate_actions",
-                "code_refactoring",
-                "configuration_changes",
-                "monitoring_recommendations",
-                "training_recommendations",
-            ]
-
-            for category in categories:
-                if mistral_analysis.get(category):
-                    display_name = category.replace("_", " ").title()
-                    content.append(f"\n**{display_name}:**\n")
-                    for item in mistral_analysis[category]:
-                        content.append(f"- {item}\n")
-
-        elif any(
-            key in mistral_analysis
-            for key in ["gdpr_compliance", "pci_dss_compliance", "hipaa_compliance"]
-        ):
-            content.append(f"### Compliance Analysis\n")
-
-            compliance_standards = ["gdpr_compliance", "pci_dss_compliance", "hipaa_compliance"]
-            for standard in compliance_standards:
-                if standard in mistral_analysis:
-                    compliance_data = mistral_analysis[standard]
-                    standard_name = standard.replace("_compliance", "").upper()
-                    content.append(
-                        f"\n**{standard_name} Compliance:** {'✅ Compliant' if compliance_data.get('compliant', False) else '❌ Not Compliant'}\n"
-                    )
-                    if compliance_data.get("issues"):
-                        content.append(f"**Issues:**\n")
-                        for issue in compliance_data["issues"]:
-                            content.append(f"- {issue}\n")
-
-            if mistral_analysis.get("owasp_top_10_violations"):
-                content.append(f"\n**OWASP Top 10 Violations:**\n")
-                for violation in mistral_analysis["owasp_top_10_violations"]:
-                    content.append(f"- {violation}\n")
-
-            if mistral_analysis.get("compliance_recommendations"):
-                content.append(f"\n**Compliance Recommendations:**\n")
-                for rec in mistral_analysis["compliance_recommendations"]:
-                    content.append(f"- {rec}\n")
-
-        else:
-            # Generic JSON display for other analysis types
-            content.append(f"### Mistral AI Analysis Results\n")
-            content.append(f"```json\n{json.dumps(mistral_analysis, indent=2)}\n```\n")
-
-        content.append(f"\n---\n")
+        for mistral_analysis in mistral_analyses:
+            _append_mistral_analysis(write, mistral_analysis)
+
+        write(f"\n---\n")
 
     # Summary section
-    content.append(f"## 📊 Summary\n")
+    write(f"## 📊 Summary\n")
 
     # Count pattern findings
-    pattern_findings = pattern_analysis
-    pattern_total = 0
-    if pattern_findings:
-        pattern_total = (
-            len(pattern_findings.get("passwords", []))
-            + len(pattern_findings.get("api_keys", []))
-            + len(pattern_findings.get("sensitive_data", []))
-            + len(pattern_findings.get("security_issues", []))
-        )
+    pattern_total = sum(len(items) for _, _, _, items in category_findings)
 
-    content.append(f"- **Pattern-Based Findings:** {pattern_total}\n")
+    write(f"- **Pattern-Based Findings:** {pattern_total}\n")
 
-    if pattern_findings:
-        content.append(f"  - Passwords: {len(pattern_findings.get('passwords', []))}\n")
-        content.append(f"  - API Keys: {len(pattern_findings.get('api_keys', []))}\n")
-        content.append(f"  - Sensitive Data: {len(pattern_findings.get('sensitive_data', []))}\n")
-        content.append(f"  - Security Issues: {len(pattern_findings.get('security_issues', []))}\n")
+    if pattern_analysis:
+        for _, label, _, items in category_findings:
+            write(f"  - {label}: {len(items)}\n")
 
     # Mistral analysis summary
-    if mistral_analysis:
-        content.append(f"- **Mistral AI Analysis:** ✅ Completed\n")
+    if mistral_analyses:
+        write(f"- **Mistral AI Analysis:** ✅ Completed\n")
 
-        # Try to extract meaningful metrics based on analysis type
-        if "overall_security_score" in mistral_analysis:
-            content.append(
-                f"  - Security Score: {mistral_analysis['overall_security_score']:.2f}/1.0\n"
-            )
-            content.append(
-                f"  - Critical Issues: {len(mistral_analysis.get('critical_issues', []))}\n"
-            )
-            content.append(f"  - Medium Issues: {len(mistral_analysis.get('medium_issues', []))}\n")
-            content.append(f"  - Low Issues: {len(mistral_analysis.get('low_issues', []))}\n")
-        elif "prompt_injection_detected" in mistral_analysis:
-            content.append(
-                f"  - Prompt Injection Detected: {mistral_analysis['prompt_injection_detected']}\n"
-            )
-            content.append(f"  - Confidence: {mistral_analysis.get('confidence_score', 0):.2f}\n")
-        elif "hallucination_risk_detected" in mistral_analysis:
-            content.append(
-                f"  - Hallucination Risk Detected: {mistral_analysis['hallucination_risk_detected']}\n"
-            )
-            content.append(f"  - Confidence: {mistral_analysis.get('confidence_score', 0):.2f}\n")
+        for mistral_analysis in mistral_analyses:
+            _append_mistral_summary(write, mistral_analysis)
     else:
-        content.append(f"- **Mistral AI Analysis:** ❌ Not performed\n")
+        write(f"- **Mistral AI Analysis:** ❌ Not performed\n")
 
     # Final recommendation
-    total_findings = pattern_total + (1 if mistral_analysis else 0)
+    total_findings = pattern_total + (1 if mistral_analyses else 0)
 
     if total_findings > 0:
-        content.append(
+        write(
             f"\n⚠️  **Recommendation:** Review the findings above and address any genuine security issues.\n"
         )
-        if mistral_analysis and "remediation_recommendations" in mistral_analysis:
-            content.append(f"**Top Remediation Recommendations:**\n")
-            recommendations = mistral_analysis["remediation_recommendations"][:3]  # Top 3
-            for rec in recommendations:
-                content.append(f"- {rec}\n")
+        for mistral_analysis in mistral_analyses:
+            if "remediation_recommendations" in mistral_analysis:
+                write(f"**Top Remediation Recommendations:**\n")
+                recommendations = mistral_analysis["remediation_recommendations"][:3]  # Top 3
+                write(_bullet_list(recommendations))
+                break
     else:
-        content.append(f"\n✅ **No security issues detected.**\n")
+        write(f"\n✅ **No security issues detected.**\n")
+
+
+def _findings_block(title: str, items: List[Dict[str, Any]], value_key: str = "match") -> str:
+    """
+    Render one pattern-finding section, or an empty string when there are no findings.
+
+    Args:
+        title: Section heading
+        items: Findings of the category
+        value_key: Finding key shown next to the line number; matches are shown as code
+    """
+    if not items:
+        return ""
+
+    quote = "`" if value_key == "match" else ""
+    entries = [
+        f"**Line {finding.get('line', 'Unknown')}:** {quote}{finding.get(value_key, '')}{quote}\n"
+        f"**Context:** `{finding.get('context', '')}`\n\n"
+        for finding in items
+    ]
+    return f"### 🔴 {title} ({len(items)})\n" + "".join(entries)
+
+
+def _bullet_list(items: List[Any]) -> str:
+    """Render items as a markdown bullet list in one join."""
+    return "".join([f"- {item}\n" for item in items])
+
+
+def _collect_mistral_analyses(findings: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return every Mistral analysis result, single or keyed by analysis type."""
+    mistral_analyses = list(findings.get("mistral_analyses", {}).values())
+    if findings.get("mistral_analysis"):
+        mistral_analyses.insert(0, findings["mistral_analysis"])
+    return mistral_analyses
+
+
+def _append_mistral_analysis(
+    write: Callable[[str], None], mistral_analysis: Dict[str, Any]
+) -> None:
+    """Write the markdown section for one Mistral analysis result."""
+    # The first renderer whose marker key is present handles the result
+    for marker_keys, render in _MISTRAL_RENDERERS:
+        if any(key in mistral_analysis for key in marker_keys):
+            render(write, mistral_analysis)
+            return
+
+    # Generic JSON display for other analysis types
+    write(f"### Mistral AI Analysis Results\n")
+    write(f"```json\n{_json_indented(mistral_analysis)}\n```\n")
+
+
+def _render_prompt_injection(
+    write: Callable[[str], None], mistral_analysis: Dict[str, Any]
+) -> None:
+    """Write a prompt injection analysis result."""
+    write(f"### Prompt Injection Analysis\n")
+    write(f"- **Detected:** {mistral_analysis.get('prompt_injection_detected', False)}\n")
+    write(f"- **Confidence:** {mistral_analysis.get('confidence_score', 0):.2f}\n")
+    if mistral_analysis.get("vulnerabilities_found"):
+        write(f"- **Vulnerabilities:** {', '.join(mistral_analysis['vulnerabilities_found'])}\n")
+    _append_analysis_and_recommendations(write, mistral_analysis)
+
+
+def _render_hallucination(write: Callable[[str], None], mistral_analysis: Dict[str, Any]) -> None:
+    """Write a hallucination risk analysis result."""
+    write(f"### Hallucination Risk Analysis\n")
+    write(f"- **Risk Detected:** {mistral_analysis.get('hallucination_risk_detected', False)}\n")
+    write(f"- **Confidence:** {mistral_analysis.get('confidence_score', 0):.2f}\n")
+    if mistral_analysis.get("risk_factors"):
+        write(f"- **Risk Factors:** {', '.join(mistral_analysis['risk_factors'])}\n")
+    _append_analysis_and_recommendations(write, mistral_analysis)
+
+
+def _render_comprehensive(write: Callable[[str], None], mistral_analysis: Dict[str, Any]) -> None:
+    """Write a comprehensive security analysis result."""
+    write(f"### Comprehensive Security Analysis\n")
+    write(f"- **Overall Score:** {mistral_analysis.get('overall_security_score', 0):.2f}/1.0\n")
+
+    critical = mistral_analysis.get("critical_issues", [])
+    medium = mistral_analysis.get("medium_issues", [])
+    low = mistral_analysis.get("low_issues", [])
+
+    write(f"- **Critical Issues:** {len(critical)}\n")
+    write(f"- **Medium Issues:** {len(medium)}\n")
+    write(f"- **Low Issues:** {len(low)}\n")
+
+    if critical:
+        write(f"\n**Critical Issues:**\n")
+        write(_bullet_list(critical))
+
+    if medium:
+        write(f"\n**Medium Issues:**\n")
+        write(_bullet_list(medium))
+
+    if low:
+        write(f"\n**Low Issues:**\n")
+        write(_bullet_list(low))
+
+    detailed_analysis = mistral_analysis.get("detailed_analysis")
+    if detailed_analysis:
+        write(f"\n**Detailed Analysis:**\n\n{detailed_analysis}\n\n")
+
+    remediation = mistral_analysis.get("remediation_recommendations")
+    if remediation:
+        write(
+            f"**Remediation Recommendations:**\n\n"
+            + "\n".join([f"- {rec}" for rec in remediation])
+            + "\n\n"
+        )
+
 
-    return "".join(content)
+def _render_secure_coding(write: Callable[[str], None], mistral_analysis: Dict[str, Any]) -> None:
+    """Write secure coding recommendations."""
+    write(f"### Secure Coding Recommendations\n")
+
+    for category, display_name in _SECURE_CODING_CATEGORIES:
+        items = mistral_analysis.get(category)
+        if items:
+            write(f"\n**{display_name}:**\n")
+            write(_bullet_list(items))
+
+
+def _render_compliance(write: Callable[[str], None], mistral_analysis: Dict[str, Any]) -> None:
+    """Write a compliance analysis result."""
+    write(f"### Compliance Analysis\n")
+
+    for standard, standard_name in _COMPLIANCE_STANDARDS:
+        if standard in mistral_analysis:
+            compliance_data = mistral_analysis[standard]
+            write(
+                f"\n**{standard_name} Compliance:** {'✅ Compliant' if compliance_data.get('compliant', False) else '❌ Not Compliant'}\n"
+            )
+            if compliance_data.get("issues"):
+                write(f"**Issues:**\n")
+                write(_bullet_list(compliance_data["issues"]))
+
+    if mistral_analysis.get("owasp_top_10_violations"):
+        write(f"\n**OWASP Top 10 Violations:**\n")
+        write(_bullet_list(mistral_analysis["owasp_top_10_violations"]))
+
+    if mistral_analysis.get("compliance_recommendations"):
+        write(f"\n**Compliance Recommendations:**\n")
+        write(_bullet_list(mistral_analysis["compliance_recommendations"]))
+
+
+# Renderers for the known analysis result shapes: (marker keys, renderer), checked in order
+_MISTRAL_RENDERERS = (
+    (("prompt_injection_detected",), _render_prompt_injection),
+    (("hallucination_risk_detected",), _render_hallucination),
+    (("overall_security_score",), _render_comprehensive),
+    (("immediate_actions",), _render_secure_coding),
+    (tuple(standard for standard, _ in _COMPLIANCE_STANDARDS), _render_compliance),
+)
+
+
+def _json_indented(value: Any) -> str:
+    """Serialize value as JSON indented by two spaces, keeping non-ASCII text readable."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(value, indent=2, ensure_ascii=False)
+
+
+def _append_analysis_and_recommendations(
+    write: Callable[[str], None], mistral_analysis: Dict[str, Any]
+) -> None:
+    """Write the free-text analysis and recommendations shared by several result types."""
+    analysis = mistral_analysis.get("analysis")
+    if analysis:
+        write(f"\n**Analysis:**\n\n{analysis}\n\n")
+
+    recommendations = mistral_analysis.get("recommendations")
+    if recommendations:
+        write(
+            f"**Recommendations:**\n\n"
+            + "\n".join([f"- {rec}" for rec in recommendations])
+            + "\n\n"
+        )
+
+
+def _append_mistral_summary(write: Callable[[str], None], mistral_analysis: Dict[str, Any]) -> None:
+    """Write summary metrics for one Mistral analysis result."""
+    # Try to extract meaningful metrics based on analysis type
+    if "overall_security_score" in mistral_analysis:
+        write(f"  - Security Score: {mistral_analysis['overall_security_score']:.2f}/1.0\n")
+        write(f"  - Critical Issues: {len(mistral_analysis.get('critical_issues', []))}\n")
+        write(f"  - Medium Issues: {len(mistral_analysis.get('medium_issues', []))}\n")
+        write(f"  - Low Issues: {len(mistral_analysis.get('low_issues', []))}\n")
+    elif "prompt_injection_detected" in mistral_analysis:
+        write(f"  - Prompt Injection Detected: {mistral_analysis['prompt_injection_detected']}\n")
+        write(f"  - Confidence: {mistral_analysis.get('confidence_score', 0):.2f}\n")
+    elif "hallucination_risk_detected" in mistral_analysis:
+        write(
+            f"  - Hallucination Risk Detected: {mistral_analysis['hallucination_risk_detected']}\n"
+        )
+        write(f"  - Confidence: {mistral_analysis.get('confidence_score', 0):.2f}\n")
@@ -0,0 +1,140 @@
+"""
+Response Cache
+
+This module provides a content-addressed, on-disk cache of Mistral AI analysis
+responses so unchanged inputs are not sent to the API again.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from .promptregistry import PROMPT_VERSION
+
+# Bump whenever the key layout changes so entries stored under older keys are not reused
+KEY_VERSION = "2"
+
+# Entries older than this many seconds are treated as misses and pruned
+DEFAULT_TTL = 30 * 24 * 60 * 60
+
+# The oldest entries beyond this count are pruned whenever a cache is opened
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+def default_cache_path() -> Path:
+    """Return the default cache location, honouring XDG_CACHE_HOME."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "agentsecops" / "responses.sqlite"
+
+
+class ResponseCache:
+    """SQLite-backed cache of analysis responses keyed by a SHA-256 digest."""
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        ttl: int = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        """
+        Open (and create if needed) the cache database, pruning stale entries.
+
+        Args:
+            path: Location of the SQLite file. Defaults to default_cache_path().
+            ttl: Age in seconds after which an entry is no longer served
+            max_entries: Number of most recent entries kept when the cache is opened
+        """
+        self.path = Path(path) if path else default_cache_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+
+        # The async client calls into the cache from executor threads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv (k TEXT PRIMARY KEY, v BLOB, ts INTEGER)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS kv_ts ON kv (ts)")
+        self._prune(max_entries)
+
+    def _prune(self, max_entries: int) -> None:
+        """Delete expired entries and all but the max_entries most recent ones."""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM kv WHERE ts < ?", (int(time.time()) - self.ttl,))
+                self._conn.execute(
+                    "DELETE FROM kv WHERE k IN "
+                    "(SELECT k FROM kv ORDER BY ts DESC LIMIT -1 OFFSET ?)",
+                    (max_entries,),
+                )
+        except sqlite3.Error:
+            pass
+
+    @staticmethod
+    def make_key(
+        model: str,
+        analysis_type: str,
+        text: str,
+        security_findings: Optional[Dict] = None,
+    ) -> str:
+        """
+        Build the cache key for one analysis request.
+
+        Args:
+            model: Mistral model name
+            analysis_type: Type of analysis performed
+            text: Text that was analyzed
+            security_findings: Optional security findings included in the prompt
+
+        Returns:
+            Hex SHA-256 digest identifying the request
+        """
+        findings = json.dumps(security_findings, sort_keys=True) if security_findings else ""
+        material = f"{KEY_VERSION}|{model}|{analysis_type}|{PROMPT_VERSION}|{findings}|{text}"
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for key, or None on a miss."""
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT v, ts FROM kv WHERE k = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+
+        value, stored_at = row
+        if stored_at is not None and stored_at >= time.time() - self.ttl:
+            try:
+                return json.loads(value)
+            except ValueError:
+                # A truncated or corrupt entry is dropped below and counted as a miss
+                pass
+        self._delete(key)
+        return None
+
+    def _delete(self, key: str) -> None:
+        """Remove the entry stored under key, if any."""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM kv WHERE k = ?", (key,))
+        except sqlite3.Error:
+            pass
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a response under key, replacing any previous entry."""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO kv (k, v, ts) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), int(time.time())),
+                )
+        except sqlite3.Error:
+            # A read-only or corrupt cache must never fail the analysis itself
+            pass
@@ -0,0 +1,198 @@
+"""
+Pattern Scan Engine
+
+This module compiles the pattern-based security signatures once at import time and
+scans whole documents with them, instead of re-running every pattern on every line.
+"""
+
+import functools
+import re
+from typing import List, Optional, Set, Tuple
+
+try:
+    import hyperscan
+except ImportError:  # hyperscan is an optional speed-up
+    hyperscan = None
+
+# Whitespace that never breaks a line (``\s`` minus every separator ``str.splitlines``
+# honours). Signatures use ``\h`` for it so a whole-document scan cannot match across
+# lines, which keeps results identical to the historical line-by-line scan.
+_HORIZONTAL_WHITESPACE = r"\t\x1f \xa0\u1680\u2000-\u200a\u202f\u205f\u3000"
+
+
+def _compile(pattern: str, flags: int = 0) -> "re.Pattern":
+    """Compile a signature, expanding ``\\h`` to horizontal whitespace."""
+    return re.compile(pattern.replace(r"\h", _HORIZONTAL_WHITESPACE), flags)
+
+
+# Signature table: (bucket, compiled pattern, issue description). The index of each
+# entry is its pattern id; descriptions are only used by the security_issues bucket.
+# Signatures are deliberately not joined into one alternation per bucket: an alternation
+# only reports whichever signature matches first at each position, while separate passes
+# let analyze_security choose among overlapping matches (preferring a labelled secret over
+# the bare alphanumeric run it starts inside). Even for the non-overlapping
+# security_issues literals a union ran ~2.5x slower than separate passes because sre
+# loses its per-literal prefix search.
+SIGNATURES = (
+    # Potential passwords
+    ("passwords", _compile(r"password[\h]*[:=][\h]*[\w\-]+", re.IGNORECASE), None),
+    ("passwords", _compile(r"passwd[\h]*[:=][\h]*[\w\-]+", re.IGNORECASE), None),
+    ("passwords", _compile(r"pwd[\h]*[:=][\h]*[\w\-]+", re.IGNORECASE), None),
+    # API keys and secrets
+    ("api_keys", _compile(r"api[\h]*key[\h]*[:=][\h]*[\w\-]+", re.IGNORECASE), None),
+    ("api_keys", _compile(r"secret[\h]*[:=][\h]*[\w\-]+", re.IGNORECASE), None),
+    ("api_keys", _compile(r"token[\h]*[:=][\h]*[\w\-]+", re.IGNORECASE), None),
+    # Long hex strings. A match can only begin where a run of these characters begins, so
+    # the lookbehind stops sre from rescanning a short run from each of its positions.
+    (
+        "api_keys",
+        _compile(r"(?<![A-Za-z0-9])[A-Za-z0-9]{32,}", re.IGNORECASE),
+        None,
+    ),
+    # Sensitive data patterns
+    ("sensitive_data", _compile(r"\d{4}[\h-]?\d{4}[\h-]?\d{4}[\h-]?\d{4}"), None),  # Cards
+    ("sensitive_data", _compile(r"\d{3}[\h-]?\d{2}[\h-]?\d{4}"), None),  # SSN patterns
+    ("sensitive_data", _compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"), None),
+    # Common security issues
+    ("security_issues", _compile(r"eval\(", re.IGNORECASE), "Use of eval() function"),
+    ("security_issues", _compile(r"exec\(", re.IGNORECASE), "Use of exec() function"),
+    ("security_issues", _compile(r"pickle\.load", re.IGNORECASE), "Use of pickle.load()"),
+    ("security_issues", _compile(r"http://", re.IGNORECASE), "Insecure HTTP protocol"),
+    ("security_issues", _compile(r"\\\\", re.IGNORECASE), "Potential path traversal"),
+)
+
+# Literal that every match of the signature with the same index must contain once
+# casefolded, or None when there is none. Checking anchors against one casefolded copy
+# of the text lets scan() skip signatures that cannot match. Anchors avoid "i", whose
+# IGNORECASE partners (U+0130, U+0131) do not casefold to it.
+_ANCHORS = (
+    "password",
+    "passwd",
+    "pwd",
+    "key",
+    "secret",
+    "token",
+    None,
+    None,
+    None,
+    "@",
+    "eval(",
+    "exec(",
+    "ckle.load",
+    "http://",
+    "\\\\",
+)
+
+# Ids of signatures matching a bare value (a long alphanumeric run, card or SSN digits)
+# rather than one introduced by a label such as "password=" or "token:"; these are exactly
+# the signatures without a literal anchor
+BARE_VALUE_SIGNATURES = frozenset(
+    pattern_id for pattern_id, anchor in enumerate(_ANCHORS) if anchor is None
+)
+
+_DIGITS = re.compile(r"\d+")
+
+
+def _build_prefilter():
+    """
+    Compile a Hyperscan database reporting which signatures can match ASCII text.
+
+    Every signature is compiled in prefilter mode (never misses a match of the original
+    pattern) with single-match reporting, so one SIMD pass over the text yields the set
+    of signature ids worth running through ``re``. Returns None without hyperscan.
+    """
+    if hyperscan is None:
+        return None
+
+    expressions = []
+    flags = []
+    for _, pattern, _ in SIGNATURES:
+        # On ASCII input the only horizontal whitespace is tab, \x1f and space
+        source = pattern.pattern.replace(_HORIZONTAL_WHITESPACE, r"\t\x1f ")
+        expressions.append(source.encode("ascii"))
+        flag = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_PREFILTER
+        if pattern.flags & re.IGNORECASE:
+            flag |= hyperscan.HS_FLAG_CASELESS
+        flags.append(flag)
+
+    database = hyperscan.Database()
+    try:
+        database.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            elements=len(expressions),
+            flags=flags,
+        )
+    except hyperscan.error:
+        return None
+    return database
+
+
+# Compiling the Hyperscan database takes ~30 ms, more than the anchor prefilter spends on
+# small inputs, so it is built on the first scan at least this long (in characters)
+# rather than at import. Once built it is used for inputs of any size.
+PREFILTER_MIN_LENGTH = 1 << 16
+
+
+@functools.lru_cache(maxsize=None)
+def _prefilter():
+    """Return the Hyperscan prefilter database, compiling it on first use."""
+    return _build_prefilter()
+
+
+def _candidate_ids(text: str) -> Optional[Set[int]]:
+    """Return the ids of signatures that may match text, or None if unknown."""
+    if hyperscan is None:
+        return None
+    if len(text) < PREFILTER_MIN_LENGTH and not _prefilter.cache_info().currsize:
+        return None
+    # Python's Unicode \d, \w and case folding only agree with Hyperscan on ASCII text
+    database = _prefilter()
+    if database is None or not text.isascii():
+        return None
+
+    candidates = set()
+    database.scan(
+        text.encode("ascii"),
+        match_event_handler=lambda pattern_id, start, end, flags, context: candidates.add(
+            pattern_id
+        ),
+    )
+    return candidates
+
+
+def scan(text: str) -> List[Tuple[int, int, int]]:
+    """
+    Scan text with every security signature.
+
+    Each signature walks the whole text once inside the C regex engine, so the cost is
+    one pass per signature rather than one Python-level loop per line and pattern.
+    Signatures that cannot match are skipped: with hyperscan installed, ASCII text is
+    first prefiltered in one pass (see PREFILTER_MIN_LENGTH); otherwise signatures whose
+    literal anchor does not occur in the text are dropped.
+
+    Args:
+        text: Text content to scan
+
+    Returns:
+        List of (pattern_id, start, end) tuples, where pattern_id indexes SIGNATURES
+    """
+    candidates = _candidate_ids(text)
+    if candidates is None:
+        folded = text.casefold()
+        candidates = [
+            pattern_id
+            for pattern_id, anchor in enumerate(_ANCHORS)
+            if anchor is None or anchor in folded
+        ]
+
+    matches = []
+    for pattern_id in sorted(candidates):
+        pattern = SIGNATURES[pattern_id][1]
+        matches.extend((pattern_id, m.start(), m.end()) for m in pattern.finditer(text))
+    return matches
+
+
+def remove_numbers(text: str) -> str:
+    """Remove every run of digits from the text."""
+    return _DIGITS.sub("", text)
@@ -4,8 +4,15 @@ Security Instructions Analysis Module
 This module provides security analysis capabilities for text content.
 """
 
-from typing import Dict, List, Any
-import re
+from bisect import bisect_right
+from itertools import accumulate
+from operator import itemgetter
+from typing import Dict, List, Any, Tuple
+
+from ..scan_engine import BARE_VALUE_SIGNATURES, SIGNATURES, scan
+
+# Line boundaries honoured by str.splitlines() other than "\n"
+_OTHER_LINE_BREAKS = "\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
 
 
 def analyze_security(content: str) -> Dict[str, Any]:
@@ -18,77 +25,127 @@ def analyze_security(content: str) -> Dict[str, Any]:
     Returns:
         Dictionary containing security findings with categories and issues
     """
+    # Scan in offset order so lines can be located in a single forward sweep
+    matches = _drop_overlaps(sorted(scan(content), key=itemgetter(1)))
+    line_count, spans = _line_spans(content, [start for _, start, _ in matches])
+
     findings = {
         "metadata": {
             "content_length": len(content),
-            "line_count": len(content.splitlines()) if content else 0,
+            "line_count": line_count,
         },
         "findings": {"passwords": [], "api_keys": [], "sensitive_data": [], "security_issues": []},
     }
 
-    # Check for common security issues
-    lines = content.splitlines() if content else []
-
-    # Pattern 1: Potential passwords
-    password_patterns = [
-        r"password[\s]*[:=][\s]*[\w\-]+",
-        r"passwd[\s]*[:=][\s]*[\w\-]+",
-        r"pwd[\s]*[:=][\s]*[\w\-]+",
+    located = [
+        (line, pattern_id, start, end, line_start, line_end)
+        for (pattern_id, start, end), (line, line_start, line_end) in zip(matches, spans)
     ]
 
-    for i, line in enumerate(lines, 1):
-        for pattern in password_patterns:
-            matches = re.finditer(pattern, line, re.IGNORECASE)
-            for match in matches:
-                findings["findings"]["passwords"].append(
-                    {"line": i, "match": match.group(), "context": line.strip()}
-                )
+    # Report in line order, then signature order, as the line-by-line scan did
+    located.sort()
+    # Bound append method and issue description of each signature, indexed by pattern id
+    appends = [findings["findings"][bucket].append for bucket, _, _ in SIGNATURES]
+    descriptions = [description for _, _, description in SIGNATURES]
+    reported_issues = set()
+    context_line, context = 0, ""
+    for line, pattern_id, start, end, line_start, line_end in located:
+        if line != context_line:
+            # Matches arrive grouped by line, so each line is sliced and stripped only once
+            context_line, context = line, content[line_start:line_end].strip()
+        description = descriptions[pattern_id]
+        if description is None:
+            appends[pattern_id]({"line": line, "match": content[start:end], "context": context})
+        elif (line, pattern_id) not in reported_issues:
+            # Security issues are reported once per line and signature
+            reported_issues.add((line, pattern_id))
+            appends[pattern_id]({"line": line, "issue": description, "context": context})
 
-    # Pattern 2: API keys and secrets
-    api_key_patterns = [
-        r"api[\s]*key[\s]*[:=][\s]*[\w\-]+",
-        r"secret[\s]*[:=][\s]*[\w\-]+",
-        r"token[\s]*[:=][\s]*[\w\-]+",
-        r"[A-Za-z0-9]{32,}",  # Long hex strings
-    ]
+    return findings
 
-    for i, line in enumerate(lines, 1):
-        for pattern in api_key_patterns:
-            matches = re.finditer(pattern, line, re.IGNORECASE)
-            for match in matches:
-                findings["findings"]["api_keys"].append(
-                    {"line": i, "match": match.group(), "context": line.strip()}
-                )
 
-    # Pattern 3: Sensitive data patterns
-    sensitive_patterns = [
-        r"\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}",  # Credit card numbers
-        r"\d{3}[\s-]?\d{2}[\s-]?\d{4}",  # SSN patterns
-        r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",  # Email addresses
-    ]
+def _drop_overlaps(matches: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+    """
+    Keep one match per run of overlapping matches of the same bucket.
 
-    for i, line in enumerate(lines, 1):
-        for pattern in sensitive_patterns:
-            matches = re.finditer(pattern, line)
-            for match in matches:
-                findings["findings"]["sensitive_data"].append(
-                    {"line": i, "match": match.group(), "context": line.strip()}
-                )
+    Overlapping matches of one bucket, such as "token: <32 hex characters>" also matching
+    the long hex string signature, report the same secret more than once. Of two
+    overlapping matches the one containing the other is kept; when neither contains the
+    other, a labelled match wins over a bare value (so "apikey=..." starting inside a long
+    alphanumeric run is still reported), and otherwise the earlier match is kept.
 
-    # Pattern 4: Common security issues
-    security_issue_patterns = [
-        (r"eval\(", "Use of eval() function"),
-        (r"exec\(", "Use of exec() function"),
-        (r"pickle\.load", "Use of pickle.load()"),
-        (r"http://", "Insecure HTTP protocol"),
-        (r"\\\\", "Potential path traversal"),
-    ]
+    Args:
+        matches: (pattern_id, start, end) tuples sorted by start, ties in signature order
 
-    for i, line in enumerate(lines, 1):
-        for pattern, description in security_issue_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                findings["findings"]["security_issues"].append(
-                    {"line": i, "issue": description, "context": line.strip()}
+    Returns:
+        The matches to report, sorted by start
+    """
+    # Index in kept of the latest match kept for each bucket
+    bucket_last = {}
+    kept = []
+    replaced = False
+    for match in matches:
+        pattern_id, start, end = match
+        bucket = SIGNATURES[pattern_id][0]
+        index = bucket_last.get(bucket)
+        if index is not None:
+            kept_id, kept_start, kept_end = kept[index]
+            if start < kept_end:
+                # Matches arrive sorted by start, so match either lies inside the kept one,
+                # contains it (same start) or partially overlaps it
+                labelled_over_bare = (
+                    kept_id in BARE_VALUE_SIGNATURES and pattern_id not in BARE_VALUE_SIGNATURES
                 )
+                if end > kept_end and (start == kept_start or labelled_over_bare):
+                    kept[index] = match
+                    replaced = True
+                continue
+        bucket_last[bucket] = len(kept)
+        kept.append(match)
 
-    return findings
+    if replaced:
+        # A replacement starts later than the match it replaced
+        kept.sort(key=itemgetter(1))
+    return kept
+
+
+def _line_spans(content: str, offsets: List[int]) -> Tuple[int, List[Tuple[int, int, int]]]:
+    """
+    Count the lines of content and find the line holding each offset.
+
+    Lines are numbered as str.splitlines() numbers them.
+
+    Args:
+        content: Text content
+        offsets: Character offsets into content, in ascending order
+
+    Returns:
+        Tuple of the line count and a (line, line_start, line_end) tuple per offset
+    """
+    # One substring search per separator is far cheaper than a regex character class
+    if not any(separator in content for separator in _OTHER_LINE_BREAKS):
+        # Only "\n" breaks lines: count and locate them with C-level str methods instead
+        # of materializing every line
+        line_count = content.count("\n") + int(not content.endswith("\n")) if content else 0
+        spans = []
+        line, previous = 1, 0
+        for offset in offsets:
+            line += content.count("\n", previous, offset)
+            previous = offset
+            line_end = content.find("\n", offset)
+            spans.append(
+                (
+                    line,
+                    content.rfind("\n", 0, offset) + 1,
+                    len(content) if line_end < 0 else line_end,
+                )
+            )
+        return line_count, spans
+
+    # Offsets at which each line starts, matching the line numbering of splitlines()
+    line_starts = [0, *accumulate(map(len, content.splitlines(keepends=True)))]
+    spans = []
+    for offset in offsets:
+        line = bisect_right(line_starts, offset)
+        spans.append((line, line_starts[line - 1], line_starts[line]))
+    return len(line_starts) - 1, spans
@@ -33,7 +33,7 @@ echo "==> [4/6] Creating Python virtual environment..."
 cd $APP_DIR
 python3 -m venv .venv
 .venv/bin/pip install --upgrade pip -q
-.venv/bin/pip install -r requirements.txt uvicorn fastapi python-multipart -q
+.venv/bin/pip install -r requirements.txt "uvicorn[standard]" fastapi httpx python-multipart -q
 
 echo "==> [5/6] Installing systemd service..."
 cp $APP_DIR/deploy/agentsecops.service /etc/systemd/system/agentsecops.service
@@ -0,0 +1,41 @@
+"""Shared pytest configuration and fixtures."""
+
+import pytest
+
+# Interactive script that checks a real API key; it is run by hand, not collected
+collect_ignore = ["test_api_key.py"]
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Client for the social media backend, with its lifespan started once per session."""
+    # The demo backend's dependencies are not needed by the core package's tests
+    TestClient = pytest.importorskip("fastapi.testclient").TestClient
+    from src.social_media_backend import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def mistral(client, monkeypatch):
+    """
+    Route the backend's upstream requests to a MockMistral for one test.
+
+    Backend test modules apply it to every test with pytestmark; until a test configures
+    another response, each request is answered with an empty successful completion.
+    """
+    httpx = pytest.importorskip("httpx")
+    from mock_mistral import MockMistral
+    from src import social_media_backend
+
+    # Start from an empty completion cache so tests may reuse the same request body
+    monkeypatch.setattr(
+        social_media_backend, "_COMPLETIONS", social_media_backend._CompletionCache()
+    )
+    upstream = MockMistral()
+    http = httpx.AsyncClient(
+        transport=httpx.MockTransport(upstream), headers=client.app.state.http.headers
+    )
+    monkeypatch.setattr(client.app.state, "http", http)
+    return upstream
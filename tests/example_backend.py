@@ -2,7 +2,9 @@
 
 import os
 
-from src.social_media_backend import GeneratePostRequest, generate_post
+from fastapi.testclient import TestClient
+
+from src.social_media_backend import app
 
 
 def main() -> None:
@@ -14,13 +16,15 @@ def main() -> None:
             "python example_backend.py"
         )
 
-    payload = GeneratePostRequest(
-        api_key=api_key,
-        prompt="generate twitter post about weather",
-        model="mistral-small-latest",
-    )
+    payload = {
+        "api_key": api_key,
+        "prompt": "generate twitter post about weather",
+        "model": "mistral-small-latest",
+    }
 
-    result = generate_post(payload)
+    # The client runs the app's lifespan, which opens the shared HTTP client
+    with TestClient(app) as client:
+        result = client.post("/generate-post", json=payload).json()
     print(result)
 
 
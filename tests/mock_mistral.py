@@ -0,0 +1,51 @@
+"""In-process stand-in for the Mistral API used by the backend tests."""
+
+import json
+
+import httpx
+
+
+class MockMistral:
+    """
+    In-process stand-in for the Mistral API, mounted as an httpx transport.
+
+    Every upstream request is recorded and answered with the configured response, so the
+    backend handles real httpx.Response objects, including streamed ones.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.error = None
+        self.respond_with_completion("")
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.error is not None:
+            raise self.error
+        return httpx.Response(self.status_code, content=self.content)
+
+    def fail_with(self, error: httpx.HTTPError) -> None:
+        """Raise error, as the transport would, for the following requests."""
+        self.error = error
+
+    def respond(self, status_code: int = 200, payload=None, content: bytes = b"") -> None:
+        """Answer the following requests with a status and a JSON payload or raw content."""
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode() if payload is not None else content
+
+    def respond_with_completion(self, text: str) -> None:
+        """Answer the following requests with a chat completion containing text."""
+        self.respond(payload={"choices": [{"message": {"content": text}}]})
+
+    def respond_with_stream(self, tokens, extra_events=()) -> None:
+        """
+        Answer the following requests with a server-sent event stream of tokens.
+
+        Raw extra_events lines are sent after the tokens, before the final [DONE] event.
+        """
+        events = [": keep-alive"]
+        for token in tokens:
+            events.append("data: " + json.dumps({"choices": [{"delta": {"content": token}}]}))
+        events.extend(extra_events)
+        events.append("data: [DONE]")
+        self.respond(content="\n\n".join(events).encode())
@@ -8,7 +8,17 @@ if __name__ == "__main__":
     host = os.getenv("BIND_HOST", "127.0.0.1")
     port = int(os.getenv("BIND_PORT", "8000"))
     reload = os.getenv("BIND_RELOAD", "false").lower() in ("true", "1", "yes")
+    # The reloader only supports a single process
+    workers = 1 if reload else int(os.getenv("WORKERS", str(os.cpu_count() or 1)))
 
+    # loop/http "auto" pick uvloop and httptools when installed (uvicorn[standard])
     uvicorn.run(
-        "src.social_media_backend:app", host=host, port=port, reload=reload, log_level="info"
+        "src.social_media_backend:app",
+        host=host,
+        port=port,
+        reload=reload,
+        workers=workers,
+        loop="auto",
+        http="auto",
+        log_level="info",
     )
@@ -1,112 +1,363 @@
 """Simple backend for generating social media posts via Mistral."""
 
-import requests
-from fastapi import FastAPI
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Tuple
+from urllib.parse import parse_qs
+
+import httpx
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 MISTRAL_CHAT_COMPLETIONS_URL = "https://api.mistral.ai/v1/chat/completions"
 
-app = FastAPI(title="Social Media Manager Backend")
+# Mistral API keys are long ASCII tokens; anything shorter is rejected without a round trip
+MIN_API_KEY_LENGTH = 20
+
+# Longest prompt accepted by /generate-post, in characters
+MAX_PROMPT_LENGTH = 8192
+
+# Headers shared by every upstream request; they are set once on the pooled client, so a
+# request only adds its own Authorization header
+_BASE_HEADERS = {"Content-Type": "application/json"}
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speed-up
+    orjson = None
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+except ImportError:
+    h2 = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_dumps(value) -> bytes:
+    """Serialize value as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Hold one pooled HTTP client for the lifetime of the server."""
+    # Connections to Mistral are kept alive and in-flight calls wait on the event loop
+    # instead of occupying threadpool workers
+    # The transport also retries failed connection attempts to ride out brief network blips
+    transport = httpx.AsyncHTTPTransport(
+        http2=h2 is not None,
+        limits=httpx.Limits(max_keepalive_connections=64, max_connections=256),
+        retries=2,
+    )
+    app.state.http = httpx.AsyncClient(
+        transport=transport,
+        timeout=60.0,
+        headers=_BASE_HEADERS,
+    )
+    try:
+        yield
+    finally:
+        await app.state.http.aclose()
+
+
+class _CompletionCache:
+    """Small LRU cache of serialized responses whose entries expire after a TTL."""
+
+    def __init__(self, maxsize: int = 512, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, bytes]]" = OrderedDict()
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[bytes]:
+        """Return the cached body for key, or None when missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, body = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return body
+
+    def set(self, key: Tuple[str, str, str], body: bytes) -> None:
+        """Store body under key, evicting the least recently used entry when full."""
+        self._entries[key] = (time.monotonic() + self.ttl, body)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+# Identical (model, API key, prompt) requests within a minute are answered without calling
+# Mistral again. Handlers run on one event loop per worker, so no lock is needed.
+_COMPLETIONS = _CompletionCache()
+
+
+async def _relay_tokens(response: httpx.Response) -> AsyncIterator[bytes]:
+    """Re-emit the content deltas of a streamed Mistral completion as server-sent events."""
+    try:
+        async for line in response.aiter_lines():
+            # Payload lines start with "data:"; skip keep-alives and blank separators
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            chunk = _json_loads(data)
+            choices = chunk.get("choices", []) if isinstance(chunk, dict) else None
+            if not isinstance(choices, list):
+                raise ValueError(f"unexpected stream chunk: {data[:80]}")
+            for choice in choices:
+                delta = (choice.get("delta") if isinstance(choice, dict) else None) or {}
+                token = delta.get("content") if isinstance(delta, dict) else None
+                if token and isinstance(token, str):
+                    # JSON-encode tokens so newlines inside them cannot break event framing
+                    yield b"data: " + _json_dumps(token) + b"\n\n"
+        yield b"data: [DONE]\n\n"
+    except (httpx.HTTPError, ValueError) as e:
+        # Covers undecodable and malformed chunks (json.JSONDecodeError is a ValueError).
+        # The status line is already sent, so the stream can only end early
+        logger.warning("Mistral stream interrupted: %s", e)
+
+
+class _RelayResponse(StreamingResponse):
+    """Server-sent event relay of a streamed Mistral completion."""
+
+    def __init__(self, upstream: httpx.Response):
+        super().__init__(_relay_tokens(upstream), media_type="text/event-stream")
+        self.upstream = upstream
+
+    async def __call__(self, scope, receive, send) -> None:
+        # Close the upstream response here rather than in the relay generator, which never
+        # runs when the client disconnects first; its pooled connection would leak
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.upstream.aclose()
+
+
+def _raise_mistral_error(response: httpx.Response) -> None:
+    """Raise the HTTPException that explains an upstream error status."""
+    status = response.status_code
+    # The body is only parsed for the statuses whose message includes it
+    if status == 429:
+        detail = "Rate limit exceeded. Please wait a moment and try again."
+    elif status == 401:
+        error_msg = _error_body(response).get("message", "")
+        logger.debug("401 error details - %s", error_msg)
+        detail = (
+            "Invalid API key. Check: 1) Key is correctly copied from Mistral console "
+            f"2) No extra spaces 3) Key is activated. API response: {error_msg}"
+        )
+    else:
+        error = _error_body(response).get("error", {})
+        # Mistral nests the message in an object, but some errors carry a bare string
+        error_detail = (
+            error.get("message", "Unknown error") if isinstance(error, dict) else str(error)
+        )
+        detail = f"Mistral API error: {error_detail}"
+    raise HTTPException(status_code=status, detail=detail)
+
+
+def _completion_text(response: httpx.Response) -> str:
+    """Return the generated text of a chat completion, or raise 502 if it is malformed."""
+    try:
+        content = _json_loads(response.content)["choices"][0]["message"]["content"]
+    except (json.JSONDecodeError, LookupError, TypeError) as e:
+        logger.warning("Malformed Mistral completion: %r", e)
+        content = None
+    if not isinstance(content, str):
+        raise HTTPException(status_code=502, detail="Mistral API returned a malformed response.")
+    return content
+
+
+def _error_body(response: httpx.Response) -> dict:
+    """Parse an upstream error body, or return an empty dict when it is empty or not JSON."""
+    try:
+        body = _json_loads(response.content) if response.content else {}
+    except json.JSONDecodeError:
+        return {}
+    return body if isinstance(body, dict) else {}
+
+
+class _VersionedStaticFiles(StaticFiles):
+    """Static files that browsers may keep for good when requested with a version tag."""
+
+    def file_response(self, full_path, stat_result, scope, status_code=200) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        # "?v=<digest>" URLs change whenever the file does, so they never need revalidation
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        if query.get("v", [""])[0]:
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+app = FastAPI(title="Social Media Manager Backend", lifespan=lifespan)
+app.add_middleware(GZipMiddleware, minimum_size=512)
 
 # Get the directory where this file is located
 BASE_DIR = Path(__file__).resolve().parent
+STATIC_DIR = BASE_DIR / "static"
 
 # Mount static files
-app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
+app.mount("/static", _VersionedStaticFiles(directory=str(STATIC_DIR)), name="static")
 
 
 class GeneratePostRequest(BaseModel):
     """Request payload for social media post generation."""
 
-    api_key: str
-    prompt: str
-    model: str = "mistral-small-latest"
+    # Unknown fields and oversized values are rejected during validation, before the handler
+    # runs. The key's format is checked in the handler so the dashboard gets a readable 400.
+    model_config = ConfigDict(extra="forbid")
+
+    api_key: str = Field(max_length=256)
+    prompt: str = Field(min_length=1, max_length=MAX_PROMPT_LENGTH)
+    model: str = Field(default="mistral-small-latest", max_length=64)
+
+
+class GeneratePostResponse(BaseModel):
+    """Generated post returned by /generate-post."""
+
+    post: str
+    model: str
+    provider: str = "mistral"
+
+
+_STATIC_ASSET_REF = re.compile(rb'(?P<attr>(?:src|href)=")/static/(?P<name>[^"?#]+)"')
+
+
+def _version_asset_refs(html: bytes) -> bytes:
+    """Tag the page's /static/ references with a digest of the file they point to."""
+
+    def _versioned(match: "re.Match[bytes]") -> bytes:
+        asset = STATIC_DIR / match["name"].decode("utf-8")
+        if not asset.is_file():
+            return match[0]
+        digest = hashlib.sha256(asset.read_bytes()).hexdigest()[:12]
+        return b'%s/static/%s?v=%s"' % (match["attr"], match["name"], digest.encode("ascii"))
+
+    return _STATIC_ASSET_REF.sub(_versioned, html)
+
+
+# The dashboard page is static: load it and its validator once instead of per request
+_INDEX_HTML = _version_asset_refs((STATIC_DIR / "index.html").read_bytes())
+_INDEX_ETAG = f'"{hashlib.sha256(_INDEX_HTML).hexdigest()[:32]}"'
+# Browsers may reuse the page for a minute, then revalidate it with If-None-Match
+_INDEX_HEADERS = {"ETag": _INDEX_ETAG, "Cache-Control": "public, max-age=60"}
 
 
 @app.get("/")
-def index():
+async def index(request: Request) -> Response:
     """Serve the frontend dashboard."""
-    return FileResponse(str(BASE_DIR / "static" / "index.html"))
+    if_none_match = request.headers.get("if-none-match", "")
+    tags = {tag.strip().replace("W/", "", 1) for tag in if_none_match.split(",")}
+    if _INDEX_ETAG in tags or "*" in tags:
+        return Response(status_code=304, headers=_INDEX_HEADERS)
+    return Response(content=_INDEX_HTML, media_type="text/html", headers=_INDEX_HEADERS)
+
+
+# The health payload never changes, so it is serialized once
+_HEALTH_BODY = _json_dumps({"status": "ok"})
 
 
 @app.get("/health")
-def health() -> dict:
+async def health() -> Response:
     """Health endpoint for quick service checks."""
-    return {"status": "ok"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
-@app.post("/generate-post")
-def generate_post(payload: GeneratePostRequest) -> dict:
-    """Generate a social media post from a user prompt using Mistral."""
+# The model documents the response schema; the handler returns pre-serialized bytes, which
+# FastAPI sends as-is without validating or encoding them again
+@app.post("/generate-post", response_model=GeneratePostResponse)
+async def generate_post(
+    payload: GeneratePostRequest, request: Request, stream: bool = False
+) -> Response:
+    """
+    Generate a social media post from a user prompt using Mistral.
+
+    With ?stream=1 the post is relayed as server-sent events while Mistral generates it:
+    one "data: <JSON string>" event per token, then "data: [DONE]".
+    """
     try:
         # Clean the API key (remove any whitespace)
         clean_api_key = payload.api_key.strip()
-
-        # Log key format for debugging (first/last 4 chars only)
-        key_preview = (
-            f"{clean_api_key[:4]}...{clean_api_key[-4:]}" if len(clean_api_key) > 8 else "***"
-        )
-        print(f"DEBUG: Using API key: {key_preview}, length: {len(clean_api_key)}")
-
-        response = requests.post(
-            MISTRAL_CHAT_COMPLETIONS_URL,
-            headers={
-                "Authorization": f"Bearer {clean_api_key}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "model": payload.model,
-                "messages": [{"role": "user", "content": payload.prompt}],
-            },
-            timeout=60,
-        )
-
-        # Handle API errors with helpful messages
-        if response.status_code == 401:
-            from fastapi import HTTPException
-
-            error_msg = response.json().get("message", "") if response.text else ""
-            print(f"DEBUG: 401 error details - {error_msg}")
-            raise HTTPException(
-                status_code=401,
-                detail=f"Invalid API key. Check: 1) Key is correctly copied from Mistral console 2) No extra spaces 3) Key is activated. API response: {error_msg}",
-            )
-        elif response.status_code == 429:
-            from fastapi import HTTPException
-
+        if (
+            len(clean_api_key) < MIN_API_KEY_LENGTH
+            or not clean_api_key.isascii()
+            or any(char.isspace() for char in clean_api_key)
+        ):
             raise HTTPException(
-                status_code=429, detail="Rate limit exceeded. Please wait a moment and try again."
+                status_code=400,
+                detail=(
+                    "API key appears malformed: expected a single ASCII token of at least "
+                    f"{MIN_API_KEY_LENGTH} characters."
+                ),
             )
-        elif response.status_code >= 400:
-            from fastapi import HTTPException
 
-            error_detail = response.json().get("error", {}).get("message", "Unknown error")
-            raise HTTPException(
-                status_code=response.status_code, detail=f"Mistral API error: {error_detail}"
+        # Log key format for debugging (first/last 4 chars only)
+        if logger.isEnabledFor(logging.DEBUG):
+            key_preview = (
+                f"{clean_api_key[:4]}...{clean_api_key[-4:]}" if len(clean_api_key) > 8 else "***"
             )
+            logger.debug("Using API key: %s, length: %d", key_preview, len(clean_api_key))
 
-        response.raise_for_status()
+        # Only a digest of the key is kept in memory
+        key_digest = hashlib.blake2b(clean_api_key.encode("utf-8"), digest_size=8).hexdigest()
+        cache_key = (payload.model, key_digest, payload.prompt)
+        cached = None if stream else _COMPLETIONS.get(cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
 
-        completion = response.json()
-        post_text = completion["choices"][0]["message"]["content"]
-
-        return {
-            "post": post_text,
+        http = request.app.state.http
+        headers = {"Authorization": f"Bearer {clean_api_key}"}
+        body = {
             "model": payload.model,
-            "provider": "mistral",
+            "messages": [{"role": "user", "content": payload.prompt}],
         }
+        if stream:
+            body["stream"] = True
+            upstream = http.build_request(
+                "POST", MISTRAL_CHAT_COMPLETIONS_URL, headers=headers, content=_json_dumps(body)
+            )
+            response = await http.send(upstream, stream=True)
+            if response.status_code < 400:
+                return _RelayResponse(response)
+            # Errors are reported like non-streamed ones, from the fully read body
+            await response.aread()
+            await response.aclose()
+        else:
+            response = await http.post(
+                MISTRAL_CHAT_COMPLETIONS_URL, headers=headers, content=_json_dumps(body)
+            )
+
+        if response.status_code >= 400:
+            _raise_mistral_error(response)
 
-    except requests.exceptions.Timeout:
-        from fastapi import HTTPException
+        post_text = _completion_text(response)
 
+        body = _json_dumps({"post": post_text, "model": payload.model, "provider": "mistral"})
+        _COMPLETIONS.set(cache_key, body)
+        return Response(content=body, media_type="application/json")
+
+    except httpx.TimeoutException:
         raise HTTPException(
             status_code=504,
             detail="Request timeout. The API took too long to respond. Please try again.",
         )
-    except requests.exceptions.RequestException as e:
-        from fastapi import HTTPException
-
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=500, detail=f"Network error: {str(e)}")
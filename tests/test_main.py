@@ -4,6 +4,9 @@ import tempfile
 import os
 import sys
 from pathlib import Path
+
+import pytest
+
 from agentsecops.main import main
 from agentsecops.securityinstructions import analyze_security
 from agentsecops.reporting import generate_report
@@ -143,6 +146,36 @@ def test_main_workflow_verbose():
             os.unlink(temp_output_path)
 
 
+def test_main_verbose_streams_header_only_for_live_requests(monkeypatch, tmp_path, capsys):
+    """The streaming header should be printed only when tokens actually arrive."""
+    from agentsecops import mistral_client
+
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("test content")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["secure", str(input_path), "-o", str(tmp_path / "report.md"), "--verbose"]
+        + ["--mistral", "--mistral-key", "test-key", "--analysis-type", "compliance"],
+    )
+
+    def _cached_analysis(text, api_key, analysis_type, findings, cache, on_token):
+        return {"owasp": []}
+
+    def _live_analysis(text, api_key, analysis_type, findings, cache, on_token):
+        on_token('{"owasp": []}')
+        return {"owasp": []}
+
+    monkeypatch.setattr(mistral_client, "analyze_with_mistral_api", _cached_analysis)
+    assert main() == 0
+    assert "Streaming" not in capsys.readouterr().out
+
+    monkeypatch.setattr(mistral_client, "analyze_with_mistral_api", _live_analysis)
+    assert main() == 0
+    assert 'Streaming Mistral AI response:\n{"owasp": []}\n' in capsys.readouterr().out
+
+
 def test_main_workflow_file_not_found():
     """Test main workflow with non-existent file."""
     original_argv = sys.argv.copy()
@@ -155,6 +188,72 @@ def test_main_workflow_file_not_found():
     sys.argv = original_argv
 
 
+def test_main_batch_mode():
+    """Test analyzing a directory of files with one report per file."""
+    original_argv = sys.argv.copy()
+
+    with tempfile.TemporaryDirectory() as batch_dir, tempfile.TemporaryDirectory() as report_dir:
+        Path(batch_dir, "nested").mkdir()
+        Path(batch_dir, "app.log").write_text("password = secret123\n", encoding="utf-8")
+        Path(batch_dir, "nested", "notes.txt").write_text("nothing here\n", encoding="utf-8")
+
+        try:
+            sys.argv = [
+                "secure",
+                "--batch",
+                batch_dir,
+                "--report-dir",
+                report_dir,
+                "--workers",
+                "2",
+            ]
+
+            result = main()
+
+            assert result == 0, "Batch mode should return 0 on success"
+            with open(Path(report_dir, "app.log.md"), "r", encoding="utf-8") as f:
+                assert "Potential Passwords Found (1)" in f.read()
+            with open(Path(report_dir, "nested", "notes.txt.md"), "r", encoding="utf-8") as f:
+                assert "No security issues detected" in f.read()
+        finally:
+            sys.argv = original_argv
+
+
+def test_main_batch_mode_skips_its_own_reports(monkeypatch, tmp_path):
+    """Reports written inside the batch directory should not be analyzed on the next run."""
+    Path(tmp_path, "app.log").write_text("password = secret123\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["secure", "--batch", ".", "--workers", "1"])
+
+    assert main() == 0
+    assert main() == 0
+
+    assert sorted(path.name for path in Path(tmp_path, "reports").rglob("*")) == ["app.log.md"]
+
+
+def test_main_batch_mode_rejects_invalid_workers(monkeypatch):
+    """A worker count below one should be a usage error rather than a traceback."""
+    for workers in ("0", "-2"):
+        monkeypatch.setattr(sys, "argv", ["secure", "--batch", ".", "--workers", workers])
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+        assert exc_info.value.code == 2
+
+
+def test_main_batch_mode_rejects_mistral():
+    """Test that batch mode refuses to fan out Mistral AI requests."""
+    original_argv = sys.argv.copy()
+
+    try:
+        sys.argv = ["secure", "--batch", ".", "--mistral"]
+        main()
+        assert False, "Should have exited with a usage error"
+    except SystemExit as e:
+        assert e.code == 2
+    finally:
+        sys.argv = original_argv
+
+
 def test_analyze_security():
     """Test the security analysis function."""
     test_content = """
@@ -219,6 +318,26 @@ def test_generate_report():
         os.unlink(temp_file_path)
 
 
+def test_generate_report_keeps_previous_report_on_failure(monkeypatch, tmp_path):
+    """A renderer failing halfway should leave the previous report untouched."""
+    from agentsecops import reporting
+
+    output_path = tmp_path / "report.md"
+    output_path.write_text("previous report", encoding="utf-8")
+
+    def _failing_emit(findings, write):
+        write("# Security Analysis Report\n")
+        raise RuntimeError("renderer failed")
+
+    monkeypatch.setattr(reporting, "_emit_report", _failing_emit)
+
+    with pytest.raises(RuntimeError):
+        generate_report({}, str(output_path))
+
+    assert output_path.read_text(encoding="utf-8") == "previous report"
+    assert list(tmp_path.iterdir()) == [output_path]
+
+
 def test_generate_report_with_mistral_analysis():
     """Test report generation with Mistral AI analysis results."""
     # Create test findings with Mistral analysis
@@ -272,6 +391,35 @@ def test_generate_report_with_mistral_analysis():
         os.unlink(temp_file_path)
 
 
+def test_generate_report_with_multiple_mistral_analyses():
+    """Test report generation with several Mistral analysis types."""
+    test_findings = {
+        "metadata": {"content_length": 100, "line_count": 5},
+        "pattern_analysis": {},
+        "mistral_analyses": {
+            "prompt_injection": {"prompt_injection_detected": True, "confidence_score": 0.9},
+            "hallucination": {"hallucination_risk_detected": False, "confidence_score": 0.2},
+        },
+    }
+
+    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".md") as temp_file:
+        temp_file_path = temp_file.name
+
+    try:
+        generate_report(test_findings, temp_file_path)
+
+        with open(temp_file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        assert "Prompt Injection Analysis" in content
+        assert "Hallucination Risk Analysis" in content
+        assert "Prompt Injection Detected: True" in content
+        assert "Hallucination Risk Detected: False" in content
+
+    finally:
+        os.unlink(temp_file_path)
+
+
 def test_empty_content():
     """Test with empty content."""
     findings = analyze_security("")
@@ -297,12 +445,15 @@ def test_no_security_issues():
 if __name__ == "__main__":
     test_main_workflow()
     test_main_workflow_with_options()
+    test_main_batch_mode()
+    test_main_batch_mode_rejects_mistral()
     test_main_workflow_no_patterns()
     test_main_workflow_verbose()
     test_main_workflow_file_not_found()
     test_analyze_security()
     test_generate_report()
     test_generate_report_with_mistral_analysis()
+    test_generate_report_with_multiple_mistral_analyses()
     test_empty_content()
     test_no_security_issues()
     print("All tests passed!")
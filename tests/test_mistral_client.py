@@ -0,0 +1,274 @@
+"""Tests for the Mistral AI client."""
+
+import asyncio
+import json
+
+from agentsecops.mistral_client import AsyncMistralClient, MistralClient
+from agentsecops.response_cache import ResponseCache
+
+
+class _MockResponse:
+    """Small fake response object for session mocking."""
+
+    status_code = 200
+    reason = "OK"
+
+    def __init__(self, content):
+        self.content = json.dumps({"choices": [{"message": {"content": content}}]}).encode()
+
+
+class _MockStreamResponse:
+    """Fake server-sent events response yielding one delta per token."""
+
+    status_code = 200
+
+    def __init__(self, tokens):
+        self.lines = [b": keep-alive", b""]
+        for token in tokens:
+            chunk = {"choices": [{"delta": {"content": token}}]}
+            self.lines += [b"data: " + json.dumps(chunk).encode(), b""]
+        self.lines.append(b"data: [DONE]")
+
+    def iter_lines(self):
+        return iter(self.lines)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def test_client_uses_persistent_session(monkeypatch):
+    """Requests should go through the client's pooled session with auth headers."""
+    client = MistralClient("test-key")
+    calls = []
+
+    def _mock_post(url, **kwargs):
+        calls.append((url, kwargs))
+        return _MockResponse(json.dumps({"prompt_injection_detected": False}))
+
+    monkeypatch.setattr(client._session, "post", _mock_post)
+
+    first = client.analyze_prompt_injection("hello")
+    second = client.analyze_prompt_injection("world")
+
+    assert first == second == {"prompt_injection_detected": False}
+    assert len(calls) == 2
+    assert client._session.headers["Authorization"] == "Bearer test-key"
+
+
+def test_client_reports_unparseable_content(monkeypatch):
+    """Non-JSON model output should be returned as an error with the raw content."""
+    client = MistralClient("test-key")
+    monkeypatch.setattr(client._session, "post", lambda url, **kwargs: _MockResponse("not json"))
+
+    result = client.analyze_compliance("hello")
+
+    assert result["error"] == "Failed to parse Mistral response as JSON"
+    assert result["raw_response"] == "not json"
+
+
+def test_async_client_runs_each_analysis_type(monkeypatch):
+    """The async client should return one result per requested analysis type."""
+    client = AsyncMistralClient("test-key", max_workers=2)
+    monkeypatch.setattr(
+        client._client._session,
+        "post",
+        lambda url, **kwargs: _MockResponse(json.dumps({"prompt": kwargs["json"]["messages"][1]})),
+    )
+
+    results = asyncio.run(
+        client.analyze_async("hello", ["prompt_injection", "hallucination", "compliance"])
+    )
+
+    assert list(results) == ["prompt_injection", "hallucination", "compliance"]
+    assert "prompt injection" in results["prompt_injection"]["prompt"]["content"]
+    assert "hallucination" in results["hallucination"]["prompt"]["content"]
+
+
+def test_client_serves_repeated_requests_from_cache(monkeypatch, tmp_path):
+    """Unchanged requests should be answered from the response cache."""
+    cache = ResponseCache(tmp_path / "responses.sqlite")
+    client = MistralClient("test-key", cache=cache)
+    calls = []
+
+    def _mock_post(url, **kwargs):
+        calls.append(kwargs)
+        return _MockResponse(json.dumps({"hallucination_risk_detected": True}))
+
+    monkeypatch.setattr(client._session, "post", _mock_post)
+
+    first = client.analyze_hallucination_risk("same text")
+    second = MistralClient("other-key", cache=cache).analyze_hallucination_risk("same text")
+    client.analyze_hallucination_risk("different text")
+
+    assert first == second == {"hallucination_risk_detected": True}
+    assert len(calls) == 2
+
+
+def test_client_does_not_cache_errors(monkeypatch, tmp_path):
+    """Failed analyses should be retried instead of replayed from the cache."""
+    client = MistralClient("test-key", cache=ResponseCache(tmp_path / "responses.sqlite"))
+    calls = []
+
+    def _mock_post(url, **kwargs):
+        calls.append(kwargs)
+        return _MockResponse("not json")
+
+    monkeypatch.setattr(client._session, "post", _mock_post)
+
+    client.analyze_compliance("hello")
+    client.analyze_compliance("hello")
+
+    assert len(calls) == 2
+
+
+def test_composite_analysis_uses_one_request(monkeypatch, tmp_path):
+    """A composite analysis should send one request and split the answer by type."""
+    client = MistralClient("test-key", cache=ResponseCache(tmp_path / "responses.sqlite"))
+    calls = []
+
+    def _mock_post(url, **kwargs):
+        calls.append(kwargs)
+        return _MockResponse(
+            json.dumps(
+                {
+                    "prompt_injection": {"prompt_injection_detected": False},
+                    "hallucination": {"hallucination_risk_detected": True},
+                }
+            )
+        )
+
+    monkeypatch.setattr(client._session, "post", _mock_post)
+
+    results = client.analyze_composite("hello", ["prompt_injection", "hallucination"])
+    cached = client.analyze_composite("hello", ["prompt_injection", "hallucination"])
+
+    assert results == cached
+    assert results == {
+        "prompt_injection": {"prompt_injection_detected": False},
+        "hallucination": {"hallucination_risk_detected": True},
+    }
+    assert len(calls) == 1
+    prompt = calls[0]["json"]["messages"][1]["content"]
+    assert '"prompt_injection": {' in prompt and '"hallucination": {' in prompt
+    assert calls[0]["json"]["max_tokens"] == 2000
+
+
+def test_single_type_composite_does_not_share_cache_entries(monkeypatch, tmp_path):
+    """A one-type composite and the plain analysis of that type should be cached apart."""
+    client = MistralClient("test-key", cache=ResponseCache(tmp_path / "responses.sqlite"))
+    answers = [{"compliance": {"owasp": []}}, {"owasp": ["A03"]}]
+    calls = []
+
+    def _mock_post(url, **kwargs):
+        calls.append(kwargs)
+        return _MockResponse(json.dumps(answers[len(calls) - 1]))
+
+    monkeypatch.setattr(client._session, "post", _mock_post)
+
+    composite = client.analyze_composite("hello", ["compliance"])
+    single = client.analyze_compliance("hello")
+
+    assert composite == {"compliance": {"owasp": []}}
+    assert single == {"owasp": ["A03"]}
+    # Both results are still replayed from their own entries
+    assert client.analyze_composite("hello", ["compliance"]) == composite
+    assert client.analyze_compliance("hello") == single
+    assert len(calls) == 2
+
+
+def test_composite_analysis_reports_missing_types(monkeypatch):
+    """Analysis types missing from a composite answer should be reported as errors."""
+    client = MistralClient("test-key")
+    monkeypatch.setattr(
+        client._session,
+        "post",
+        lambda url, **kwargs: _MockResponse(json.dumps({"compliance": {"owasp": []}})),
+    )
+
+    results = client.analyze_composite("hello", ["compliance", "secure_coding"])
+
+    assert results["compliance"] == {"owasp": []}
+    assert "secure_coding" in results["secure_coding"]["error"]
+
+
+def test_client_streams_tokens(monkeypatch):
+    """With on_token the answer should be streamed and assembled from the deltas."""
+    client = MistralClient("test-key")
+    calls = []
+
+    def _mock_post(url, **kwargs):
+        calls.append(kwargs)
+        return _MockStreamResponse(['{"prompt_injection', '_detected": ', "true}"])
+
+    monkeypatch.setattr(client._session, "post", _mock_post)
+    tokens = []
+
+    result = client.analyze_with_mistral("hello", "prompt_injection", on_token=tokens.append)
+
+    assert result == {"prompt_injection_detected": True}
+    assert tokens == ['{"prompt_injection', '_detected": ', "true}"]
+    assert calls[0]["stream"] is True
+    assert calls[0]["json"]["stream"] is True
+
+
+def test_client_compacts_text_before_sending(monkeypatch):
+    """Whitespace padding should not be sent, but indentation and line numbering should."""
+    client = MistralClient("test-key")
+    calls = []
+
+    def _mock_post(url, **kwargs):
+        calls.append(kwargs)
+        return _MockResponse(json.dumps({"prompt_injection_detected": False}))
+
+    monkeypatch.setattr(client._session, "post", _mock_post)
+
+    client.analyze_prompt_injection("first   line  \n\n  \nif x:\n    second\t\tline\nsame\nsame\n")
+
+    prompt = calls[0]["json"]["messages"][1]["content"]
+    assert "first line\n\n\nif x:\n    second line\nsame\nsame\n" in prompt
+
+
+def test_client_sends_compact_findings(monkeypatch):
+    """Security findings should be embedded in the prompt as compact JSON."""
+    client = MistralClient("test-key")
+    calls = []
+
+    def _mock_post(url, **kwargs):
+        calls.append(kwargs)
+        return _MockResponse(json.dumps({"overall_security_score": 0.5}))
+
+    monkeypatch.setattr(client._session, "post", _mock_post)
+
+    client.analyze_security("hello", {"findings": {"passwords": [{"line": 1}]}})
+
+    prompt = calls[0]["json"]["messages"][1]["content"]
+    assert '{"findings":{"passwords":[{"line":1}]}}' in prompt
+
+
+def test_client_retries_transient_post_failures():
+    """The session should retry POSTs on rate limiting and server errors."""
+    client = MistralClient("test-key")
+
+    retry = client._session.get_adapter(client.base_url).max_retries
+
+    assert "POST" in retry.allowed_methods
+    assert {429, 500, 503} <= set(retry.status_forcelist)
+    assert retry.respect_retry_after_header
+
+
+def test_client_reports_http_errors(monkeypatch):
+    """Error statuses should be reported with their status code."""
+    client = MistralClient("test-key")
+    response = _MockResponse("{}")
+    response.status_code = 401
+    response.reason = "Unauthorized"
+    response.close = lambda: None
+    monkeypatch.setattr(client._session, "post", lambda url, **kwargs: response)
+
+    result = client.analyze_compliance("hello")
+
+    assert result["status_code"] == 401
+    assert "HTTP 401: Unauthorized" in result["error"]
@@ -0,0 +1,67 @@
+"""Tests for the on-disk response cache."""
+
+import sqlite3
+
+from agentsecops import response_cache
+from agentsecops.response_cache import ResponseCache
+
+
+def _stored_keys(path):
+    """Return the keys currently stored in the cache file at path."""
+    with sqlite3.connect(str(path)) as conn:
+        return {row[0] for row in conn.execute("SELECT k FROM kv")}
+
+
+def test_cache_round_trip(tmp_path):
+    """Stored responses should be returned for their key only."""
+    cache = ResponseCache(tmp_path / "responses.sqlite")
+
+    cache.set("a", {"compliance": {"owasp": []}})
+
+    assert cache.get("a") == {"compliance": {"owasp": []}}
+    assert cache.get("b") is None
+
+
+def test_cache_drops_corrupt_entries(tmp_path):
+    """An entry that is not valid JSON should count as a miss and be removed."""
+    path = tmp_path / "responses.sqlite"
+    cache = ResponseCache(path)
+    cache.set("a", {"ok": True})
+    cache._conn.execute("UPDATE kv SET v = ? WHERE k = ?", ('{"ok": tr', "a"))
+
+    assert cache.get("a") is None
+    assert _stored_keys(path) == set()
+
+
+def test_cache_expires_entries(tmp_path, monkeypatch):
+    """Entries older than the TTL should be misses and pruned when the cache is opened."""
+    path = tmp_path / "responses.sqlite"
+    now = [1_000_000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    cache = ResponseCache(path, ttl=60)
+    cache.set("old", {"n": 1})
+    now[0] += 30
+    cache.set("new", {"n": 2})
+    now[0] += 45
+
+    assert cache.get("old") is None
+    assert cache.get("new") == {"n": 2}
+
+    now[0] += 60
+    ResponseCache(path, ttl=60)
+    assert _stored_keys(path) == set()
+
+
+def test_cache_keeps_most_recent_entries(tmp_path, monkeypatch):
+    """Opening a cache should keep only the max_entries most recently stored entries."""
+    path = tmp_path / "responses.sqlite"
+    now = [1_000_000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    cache = ResponseCache(path)
+    for key in "abcd":
+        cache.set(key, {"key": key})
+        now[0] += 1
+
+    ResponseCache(path, max_entries=2)
+
+    assert _stored_keys(path) == {"c", "d"}
@@ -0,0 +1,139 @@
+"""Tests for the pattern scan engine."""
+
+import pytest
+
+from agentsecops import scan_engine
+from agentsecops.scan_engine import SIGNATURES, remove_numbers, scan
+from agentsecops.securityinstructions import analyze_security
+
+
+def test_scan_reports_pattern_ids_and_offsets():
+    """Scan should return the signature id and span of each match."""
+    text = "config\npassword = hunter2\n"
+
+    matches = scan(text)
+
+    assert len(matches) == 1
+    pattern_id, start, end = matches[0]
+    assert SIGNATURES[pattern_id][0] == "passwords"
+    assert text[start:end] == "password = hunter2"
+
+
+def test_scan_does_not_match_across_lines():
+    """Signatures should never span a line break."""
+    assert scan("password\n= hunter2") == []
+    assert scan("password\r\n= hunter2") == []
+
+
+def test_scan_anchor_prefilter_is_case_insensitive():
+    """Skipping signatures by literal anchor must not drop case-folded matches."""
+    text = "PASSWORD = a\n\u017fecret: b\nPİCKLE.LOAD(x)\n"
+
+    buckets = sorted(SIGNATURES[pattern_id][0] for pattern_id, _, _ in scan(text))
+
+    assert buckets == ["api_keys", "passwords", "security_issues"]
+    assert scan("nothing to see here") == []
+
+
+def test_scan_hyperscan_prefilter_matches_plain_scan(monkeypatch):
+    """The Hyperscan prefilter must only skip signatures that cannot match."""
+    if scan_engine._prefilter() is None:
+        pytest.skip("hyperscan is not installed")
+
+    text = (
+        "PassWd:\tabc\napi  KEY = k-1\neval(x) pickle.LOAD http://h \\\\srv\n"
+        "4111 1111-1111 1111 123-45-6789 a.b@example.org " + "Ab9" * 11
+    )
+    prefiltered = scan(text)
+    assert scan_engine._candidate_ids(text) is not None
+    monkeypatch.setattr(scan_engine, "hyperscan", None)
+
+    assert prefiltered == scan(text)
+    assert scan_engine._candidate_ids(text) is None
+
+
+def test_scan_builds_hyperscan_prefilter_lazily(monkeypatch):
+    """Small inputs should not pay for compiling the Hyperscan database."""
+    if scan_engine.hyperscan is None:
+        pytest.skip("hyperscan is not installed")
+    monkeypatch.setattr(scan_engine, "PREFILTER_MIN_LENGTH", 100)
+    scan_engine._prefilter.cache_clear()
+
+    assert scan_engine._candidate_ids("password = x") is None
+    assert scan_engine._prefilter.cache_info().currsize == 0
+
+    assert scan_engine._candidate_ids("x" * 100) is not None
+    # Once compiled, the database is used for small inputs too
+    assert scan_engine._candidate_ids("password = x") is not None
+
+
+def test_analyze_security_line_numbers():
+    """Findings should carry the line number and stripped line as context."""
+    content = "first line\n  token: abc-123  \nhttp://a http://b\n"
+
+    findings = analyze_security(content)["findings"]
+
+    assert findings["api_keys"] == [
+        {"line": 2, "match": "token: abc-123", "context": "token: abc-123"}
+    ]
+    # Security issues are reported once per line even with several matches
+    assert findings["security_issues"] == [
+        {"line": 3, "issue": "Insecure HTTP protocol", "context": "http://a http://b"}
+    ]
+
+
+def test_analyze_security_line_numbers_with_other_line_breaks():
+    """Lines should be numbered like str.splitlines() for CRLF and Unicode breaks too."""
+    content = "a\r\nb\u2028password = x\x85\n"
+
+    findings = analyze_security(content)
+
+    assert findings["metadata"]["line_count"] == 4
+    assert findings["findings"]["passwords"] == [
+        {"line": 3, "match": "password = x", "context": "password = x"}
+    ]
+
+
+def test_analyze_security_drops_overlapping_matches():
+    """A secret matched by several signatures of one bucket should be reported once."""
+    secret = "Ab9" * 11
+    content = f"token: {secret}\npassword = x pwd=y\n{secret}\n"
+
+    findings = analyze_security(content)["findings"]
+
+    assert findings["api_keys"] == [
+        {"line": 1, "match": f"token: {secret}", "context": f"token: {secret}"},
+        {"line": 3, "match": secret, "context": secret},
+    ]
+    # Matches of one bucket that do not overlap are all kept
+    assert [finding["match"] for finding in findings["passwords"]] == ["password = x", "pwd=y"]
+
+
+def test_analyze_security_prefers_labelled_secret_inside_bare_run():
+    """A labelled secret starting inside a long alphanumeric run should still be reported."""
+    content = "b" * 40 + "apikey=Kx\n" + "c" * 40 + " token: t-1\n"
+
+    findings = analyze_security(content)["findings"]
+
+    assert [finding["match"] for finding in findings["api_keys"]] == [
+        "apikey=Kx",
+        "token: t-1",
+        "c" * 40,
+    ]
+
+
+def test_remove_numbers():
+    """Digit runs should be removed."""
+    assert remove_numbers("room 101, floor 3") == "room , floor "
+
+
+if __name__ == "__main__":
+    test_scan_reports_pattern_ids_and_offsets()
+    test_scan_does_not_match_across_lines()
+    test_scan_anchor_prefilter_is_case_insensitive()
+    test_analyze_security_line_numbers()
+    test_analyze_security_line_numbers_with_other_line_breaks()
+    test_analyze_security_drops_overlapping_matches()
+    test_analyze_security_prefers_labelled_secret_inside_bare_run()
+    test_remove_numbers()
+    print("All scan engine tests passed!")
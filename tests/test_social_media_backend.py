@@ -1,63 +1,228 @@
-"""Tests for the social media backend."""
+"""Tests for the social media backend's calls to the Mistral API, which are mocked."""
 
-from fastapi.testclient import TestClient
+import asyncio
+import json
 
-from src.social_media_backend import app
+import httpx
+import pytest
 
+from src.social_media_backend import MIN_API_KEY_LENGTH, _CompletionCache, _RelayResponse
 
-class _MockResponse:
-    """Small fake response object for requests mocking."""
+# Every test runs against the mock Mistral API, so none can reach the network by accident
+pytestmark = pytest.mark.usefixtures("mistral")
 
-    def __init__(self, payload):
-        self._payload = payload
+MODELS = ("mistral-small-latest", "mistral-medium-latest", "mistral-large-latest")
+POST_TEXT = "Launch day update: we're shipping faster this week."
+API_KEY = "test-key-0123456789abcdef"
+# A prompt exactly at the length limit, built once at import
+LONG_PROMPT = "Write a social media post about " + "AI " * 2720
+_BASE_REQUEST = {"api_key": API_KEY, "prompt": "Write launch post", "model": MODELS[0]}
 
-    def raise_for_status(self):
-        """Simulate a successful request."""
 
-    def json(self):
-        return self._payload
+def _request(**overrides):
+    """Return a /generate-post body with the given fields replaced."""
+    return {**_BASE_REQUEST, **overrides}
 
 
-def test_health():
-    """Health endpoint should return ok status."""
-    client = TestClient(app)
-    response = client.get("/health")
+@pytest.mark.parametrize("model", MODELS)
+def test_generate_post(client, mistral, model):
+    """Generate endpoint should return extracted post content for the requested model."""
+    mistral.respond_with_completion(POST_TEXT)
+
+    response = client.post(
+        "/generate-post",
+        json=_request(model=model),
+    )
 
     assert response.status_code == 200
-    assert response.json() == {"status": "ok"}
+    assert response.json() == {"post": POST_TEXT, "model": model, "provider": "mistral"}
+    upstream = mistral.requests[0]
+    assert upstream.headers["Authorization"] == f"Bearer {API_KEY}"
+    sent = json.loads(upstream.content)
+    assert sent["model"] == model
+    assert sent["messages"] == [{"role": "user", "content": "Write launch post"}]
+
+
+def test_generate_post_streams_tokens(client, mistral):
+    """With ?stream=1 each token should be relayed as its own server-sent event."""
+    mistral.respond_with_stream(["Launch", " day\n", "!"])
+
+    response = client.post(
+        "/generate-post?stream=1",
+        json=_request(),
+    )
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text == 'data: "Launch"\n\ndata: " day\\n"\n\ndata: "!"\n\ndata: [DONE]\n\n'
+    assert json.loads(mistral.requests[0].content)["stream"] is True
+
+
+@pytest.mark.parametrize(
+    "events, text",
+    [
+        (['data: {"choices": [{"delta": null}, {}]}'], 'data: "Hi"\n\ndata: [DONE]\n\n'),
+        (['data: {"usage": {}}'], 'data: "Hi"\n\ndata: [DONE]\n\n'),
+        (["data: []"], 'data: "Hi"\n\n'),
+        (['data: "x"'], 'data: "Hi"\n\n'),
+        (['data: {"choices": {}}'], 'data: "Hi"\n\n'),
+        (["data: {"], 'data: "Hi"\n\n'),
+    ],
+)
+def test_generate_post_stream_tolerates_malformed_chunks(client, mistral, events, text):
+    """Chunks without tokens should be skipped and malformed ones should end the stream."""
+    mistral.respond_with_stream(["Hi"], events)
+
+    response = client.post("/generate-post?stream=1", json=_request())
+
+    assert response.status_code == 200
+    assert response.text == text
+
+
+def test_relay_closes_upstream_when_client_disconnects():
+    """The upstream stream should be released even if the relay body is never iterated."""
+
+    class _UpstreamStream(httpx.AsyncByteStream):
+        closed = False
+
+        async def __aiter__(self):
+            yield b"data: [DONE]\n\n"
+
+        async def aclose(self):
+            self.closed = True
+
+    stream = _UpstreamStream()
+    relay = _RelayResponse(httpx.Response(200, stream=stream))
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        pass
+
+    asyncio.run(relay({"type": "http", "asgi": {"spec_version": "2.0"}}, receive, send))
+
+    assert stream.closed
 
 
-def test_generate_post(monkeypatch):
-    """Generate endpoint should return extracted post content."""
+@pytest.mark.parametrize(
+    "status_code, payload, detail",
+    [
+        (401, {"message": "Unauthorized"}, "Invalid API key. Check: 1) Key is correctly copied"),
+        (429, {}, "Rate limit exceeded. Please wait a moment and try again."),
+        (503, {"error": {"message": "overloaded"}}, "Mistral API error: overloaded"),
+        (400, {}, "Mistral API error: Unknown error"),
+        (502, {"error": "bad gateway"}, "Mistral API error: bad gateway"),
+    ],
+)
+def test_generate_post_maps_upstream_errors(client, mistral, status_code, payload, detail):
+    """Upstream error statuses should be passed through with an explanatory detail."""
+    mistral.respond(status_code, payload)
 
-    def _mock_post(*args, **kwargs):
-        return _MockResponse(
-            {
-                "choices": [
-                    {
-                        "message": {
-                            "content": "Launch day update: we're shipping faster this week.",
-                        }
-                    }
-                ]
-            }
-        )
+    response = client.post("/generate-post", json=_request())
 
-    monkeypatch.setattr("src.social_media_backend.requests.post", _mock_post)
+    assert response.status_code == status_code
+    assert response.json()["detail"].startswith(detail)
+
+
+@pytest.mark.parametrize(
+    "error, status_code, detail",
+    [
+        (httpx.ReadTimeout("timed out"), 504, "Request timeout."),
+        (httpx.ConnectError("connection refused"), 500, "Network error: connection refused"),
+    ],
+)
+def test_generate_post_maps_transport_errors(client, mistral, error, status_code, detail):
+    """Timeouts and network failures talking to Mistral should map to 504 and 500."""
+    mistral.fail_with(error)
+
+    response = client.post("/generate-post", json=_request())
+
+    assert response.status_code == status_code
+    assert response.json()["detail"].startswith(detail)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [{}, {"choices": []}, {"choices": [{"message": {}}]}, {"choices": [{"message": None}]}],
+)
+def test_generate_post_rejects_malformed_completion(client, mistral, payload):
+    """A successful upstream status with an unexpected body should map to 502."""
+    mistral.respond(payload=payload)
 
-    client = TestClient(app)
     response = client.post(
         "/generate-post",
-        json={
-            "api_key": "test-key",
-            "prompt": "Write launch post",
-            "model": "mistral-small-latest",
-        },
+        json=_request(),
     )
 
+    assert response.status_code == 502
+    assert response.json() == {"detail": "Mistral API returned a malformed response."}
+
+
+def test_generate_post_reports_unparseable_error_body(client, mistral):
+    """An upstream error without a JSON body should still map to its status code."""
+    mistral.respond(401, content=b"<html>Unauthorized</html>")
+
+    response = client.post("/generate-post", json=_request())
+
+    assert response.status_code == 401
+    assert response.json()["detail"].startswith("Invalid API key.")
+
+
+def test_generate_post_caches_identical_requests(client, mistral):
+    """Repeating a request with the same key, model and prompt should not call Mistral."""
+    mistral.respond_with_completion("Post 1")
+    first = client.post("/generate-post", json=_request())
+    second = client.post("/generate-post", json=_request())
+    mistral.respond_with_completion("Post 2")
+    other = client.post("/generate-post", json=_request(prompt="Something else"))
+
+    # The cached response is replayed byte for byte
+    assert first.content == second.content
+    assert first.json()["post"] == "Post 1"
+    assert other.json()["post"] == "Post 2"
+    assert len(mistral.requests) == 2
+
+
+def test_completion_cache_expires_and_evicts(monkeypatch):
+    """Entries should expire after the TTL and the least recently used should be evicted."""
+    now = [100.0]
+    monkeypatch.setattr("src.social_media_backend.time.monotonic", lambda: now[0])
+    cache = _CompletionCache(maxsize=2, ttl=60)
+
+    cache.set(("m", "k", "a"), b"a")
+    cache.set(("m", "k", "b"), b"b")
+    assert cache.get(("m", "k", "a")) == b"a"
+    cache.set(("m", "k", "c"), b"c")
+
+    assert cache.get(("m", "k", "b")) is None
+    now[0] += 61
+    assert cache.get(("m", "k", "a")) is None
+
+
+def test_generate_post_rejects_malformed_key_without_calling_mistral(client, mistral):
+    """Keys that cannot be valid should fail with 400 before any upstream request."""
+    for api_key in ("short", "   ", "has spaces 0123456789abcdef", "ключ" * 10):
+        response = client.post("/generate-post", json=_request(api_key=api_key))
+        assert response.status_code == 400
+        assert f"at least {MIN_API_KEY_LENGTH} characters" in response.json()["detail"]
+
+    assert mistral.requests == []
+
+
+@pytest.mark.parametrize(
+    "prompt",
+    [
+        LONG_PROMPT,
+        "Write about: @#$%^&*()[]{}|\\<>?/~`\"'",
+        "Write about: 你好世界 🚀 émojis",
+    ],
+    ids=["long", "special-characters", "unicode"],
+)
+def test_generate_post_forwards_prompt_unchanged(client, mistral, prompt):
+    """Long prompts and prompts with special or non-ASCII characters should reach Mistral intact."""
+    mistral.respond_with_completion(POST_TEXT)
+
+    response = client.post("/generate-post", json=_request(prompt=prompt))
+
     assert response.status_code == 200
-    assert response.json() == {
-        "post": "Launch day update: we're shipping faster this week.",
-        "model": "mistral-small-latest",
-        "provider": "mistral",
-    }
+    assert json.loads(mistral.requests[0].content)["messages"][0]["content"] == prompt
@@ -0,0 +1,63 @@
+"""
+Tests for the social media backend that never reach the Mistral API.
+
+Requests here are served by the app itself or rejected during validation, so they run
+without the mistral fixture used by test_social_media_backend.py.
+"""
+
+import re
+
+from src.social_media_backend import MAX_PROMPT_LENGTH
+
+_VALID_REQUEST = {"api_key": "test-key-0123456789abcdef", "prompt": "Hi"}
+OVERSIZED_PROMPT = "x" * (MAX_PROMPT_LENGTH + 1)
+
+
+def test_health(client):
+    """Health endpoint should return ok status."""
+    response = client.get("/health")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+def test_index_served_with_etag(client):
+    """The dashboard should be served with an ETag and revalidate to 304."""
+    response = client.get("/")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert response.headers["cache-control"] == "public, max-age=60"
+    etag = response.headers["etag"]
+
+    cached = client.get("/", headers={"If-None-Match": etag})
+
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert client.get("/", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_static_assets_versioned_and_compressed(client):
+    """Assets referenced by the page should carry a version tag and be cached for good."""
+    page = client.get("/").text
+
+    script = re.search(r'src="(/static/app\.js\?v=[0-9a-f]+)"', page)
+    assert script is not None
+
+    versioned = client.get(script[1], headers={"Accept-Encoding": "gzip"})
+    assert versioned.status_code == 200
+    assert versioned.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert versioned.headers["content-encoding"] == "gzip"
+    for query in ("", "?v=", "?dev=1", "?nav=x"):
+        assert "cache-control" not in client.get("/static/app.js" + query).headers
+
+
+def test_generate_post_validates_payload_shape(client):
+    """Missing or unknown fields and empty or oversized prompts should fail validation."""
+    for payload in (
+        {**_VALID_REQUEST, "temperature": 2},
+        {**_VALID_REQUEST, "prompt": ""},
+        {**_VALID_REQUEST, "prompt": OVERSIZED_PROMPT},
+        {"prompt": "Hi"},
+    ):
+        assert client.post("/generate-post", json=payload).status_code == 422